@@ -0,0 +1,307 @@
+from typing import Optional
+
+import numpy as np
+
+import rules
+from engine import TILE, Engine, step_padded
+
+BLOCK = 16
+# Above this fraction of active blocks the whole board is stepped at once:
+# gathering each block's window costs several times more per cell. Meanwhile
+# every block counts as active, and the real active set is only worked out
+# every DENSE_CHECK generations to see whether the board has quietened down.
+DENSE = 0.10
+DENSE_CHECK = 8
+
+
+class ActiveEngine(Engine):
+    """
+    Byte-per-cell board that only re-evaluates blocks touched by last generation's changes.
+
+    The board is split into BLOCK x BLOCK blocks. After each step, every block
+    that changed is marked active, and so is any neighboring block whose shared
+    edge or corner saw a change. Still lifes and empty space cost nothing.
+    While more than DENSE of the blocks are active, the board is stepped as
+    one array instead and the active set is read off the cells that changed.
+    Each block also carries the revision it last changed at, so
+    region_density() only re-sums the tiles that did.
+    """
+
+    name = "active"
+    generations = True
+    # Empty blocks are never visited, so empty space cannot give birth
+    birth_on_zero = False
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True, block: int = BLOCK):
+        super().__init__(cols, rows, wrap)
+        self.block = block
+
+        # Flat board plus one trailing cell that is always dead (off-board reads).
+        # Whole-board steps replace cells instead; flat only catches up when
+        # the board goes back to blocks, and until then every block is active.
+        self.flat = np.zeros(rows * cols + 1, dtype=np.uint8)
+        self.cells = self.flat[:-1].reshape(rows, cols)
+
+        self.brows = (rows + block - 1) // block
+        self.bcols = (cols + block - 1) // block
+        self.active = np.zeros((self.brows, self.bcols), dtype=bool)
+        self.block_revs = np.zeros((self.brows, self.bcols), dtype=np.int64)
+        # Whole-board steps (see _step_all): a halo-padded copy of the board,
+        # refilled each generation, and the changed cells padded out to whole blocks
+        self._pad = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self._changed = np.zeros((self.brows * block, self.bcols * block), dtype=bool)
+
+        # Index tables per wrap mode, built on first use, so toggling wrap is O(1).
+        self._tables: dict[bool, tuple[np.ndarray, np.ndarray]] = {}
+        self._use_tables()
+
+    def _use_tables(self) -> None:
+        if self.wrap not in self._tables:
+            self._tables[self.wrap] = self._build_tables()
+        self.win_idx, self.on_board = self._tables[self.wrap]
+
+    def _build_tables(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        For every block: the flat indices of its (block + 2)^2 window (halo
+        included) and which interior cells are actually on the board.
+        """
+        b = self.block
+        rows, cols = self.rows, self.cols
+        off = np.arange(-1, b + 1)
+
+        r = (np.arange(self.brows) * b)[:, None] + off[None, :]   # (brows, b + 2)
+        c = (np.arange(self.bcols) * b)[:, None] + off[None, :]   # (bcols, b + 2)
+        if self.wrap:
+            r_ok = np.ones_like(r, dtype=bool)
+            c_ok = np.ones_like(c, dtype=bool)
+            r, c = r % rows, c % cols
+        else:
+            r_ok = (r >= 0) & (r < rows)
+            c_ok = (c >= 0) & (c < cols)
+
+        idx = r[:, None, :, None] * cols + c[None, :, None, :]
+        ok = r_ok[:, None, :, None] & c_ok[None, :, None, :]
+        idx = np.where(ok, idx, rows * cols)
+        win_idx = idx.reshape(self.brows * self.bcols, b + 2, b + 2).astype(np.intp)
+
+        # Interior cells past the last row/col of a partial edge block (overhang).
+        rr = (np.arange(self.brows) * b)[:, None] + np.arange(b)[None, :]
+        cc = (np.arange(self.bcols) * b)[:, None] + np.arange(b)[None, :]
+        on_board = (rr < rows)[:, None, :, None] & (cc < cols)[None, :, None, :]
+        return win_idx, on_board.reshape(self.brows * self.bcols, b, b)
+
+    # --- conversion / editing ---
+    def to_array(self) -> np.ndarray:
+        return self.cells
+
+    def _load(self, cells: np.ndarray) -> None:
+        self.cells[:] = np.asarray(cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        self.active[:] = True
+        self.block_revs[:] = self.revision
+
+    def get(self, col: int, row: int) -> bool:
+        return bool(self.cells[row, col] == 1)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        self.cells[row, col] = 1 if alive else 0
+        self.block_revs[row // self.block, col // self.block] = self.revision
+        self._wake(row, col)
+
+    def set_wrap(self, wrap: bool) -> None:
+        if wrap != self.wrap:
+            super().set_wrap(wrap)
+            self._use_tables()
+            # Edge cells see different neighbors now.
+            self.active[:] = True
+
+    def set_rule(self, rule: rules.Rule) -> None:
+        super().set_rule(rule)
+        # Settled blocks may not be settled under the new rule.
+        self.active[:] = True
+
+    def _wake(self, row: int, col: int) -> None:
+        """Mark the blocks around one edited cell."""
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                r, c = row + dr, col + dc
+                if self.wrap:
+                    r %= self.rows
+                    c %= self.cols
+                elif not (0 <= r < self.rows and 0 <= c < self.cols):
+                    continue
+                self.active[r // self.block, c // self.block] = True
+
+    def _tile_revisions(self) -> np.ndarray:
+        k = TILE // self.block
+        if TILE % self.block:
+            return super()._tile_revisions()
+        # A tile's revision is its newest block's (revisions only go up)
+        revs = self.block_revs
+        ty, tx = -(-self.brows // k), -(-self.bcols // k)
+        padded = np.zeros((ty * k, tx * k), dtype=np.int64)
+        padded[:self.brows, :self.bcols] = revs
+        return padded.reshape(ty, k, tx, k).max(axis=(1, 3))
+
+    def active_count(self) -> int:
+        return int(np.count_nonzero(self.active))
+
+    # --- evolution ---
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            self._step_once(changes=False)
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        at, old, new = self._step_once()
+        ys, xs = np.divmod(at, self.cols)
+        return xs, ys, old, new
+
+    def _step_once(self, changes: bool = True) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        One generation; returns the flat indices, old and new states of the
+        cells it changed (None from a whole-board step unless changes is set).
+        """
+        bi, bj = np.nonzero(self.active)
+        if bi.size == 0:
+            self._record(0, 0)
+            none = np.zeros(0, dtype=np.uint8)
+            return none.astype(np.intp), none, none
+        if bi.size > DENSE * self.active.size:
+            return self._step_all(changes)
+
+        blk = bi * self.bcols + bj
+        idx = self.win_idx[blk]
+        win = self.flat[idx]
+
+        # All active blocks at once, as a batch of halo-padded windows
+        old = win[:, 1:-1, 1:-1]
+        new = step_padded(win, self.rule)
+
+        # Only write cells that are on the board (partial edge blocks overhang).
+        changed = (new != old) & self.on_board[blk]
+        at = idx[:, 1:-1, 1:-1][changed]
+        was, flipped = old[changed], new[changed]
+        self.flat[at] = flipped
+        self._record(int(np.count_nonzero(flipped == 1)), int(np.count_nonzero(was == 1)))
+        self._activate(bi, bj, changed)
+        return at, was, flipped
+
+    def _step_all(self, changes: bool) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """_step_once() for a busy board: one whole-array step, as the numpy engine does."""
+        new = step_padded(self._padded(), self.rule)
+        check = self.stats.generation % DENSE_CHECK == 0
+        if changes or check:
+            changed = np.not_equal(new, self.cells, out=self._changed[:self.rows, :self.cols])
+        out = None
+        if changes:
+            at = np.flatnonzero(changed)
+            was, flipped = self.cells.ravel()[at], new.ravel()[at]
+            self._record(int(np.count_nonzero(flipped == 1)), int(np.count_nonzero(was == 1)))
+            out = at, was, flipped
+        else:
+            self._record(*rules.births_deaths(self.cells, new, self.rule.states))
+        self.cells = new
+
+        if check:
+            # The padding past the board never changes, so every block is whole.
+            b, brows, bcols = self.block, self.brows, self.bcols
+
+            def across(rows: np.ndarray) -> np.ndarray:
+                return rows.reshape(brows, bcols, b).any(axis=2)
+
+            def down(cols: np.ndarray) -> np.ndarray:
+                return cols.reshape(brows, b, -1).any(axis=1)
+
+            grid = self._changed
+            hit = across(down(grid))
+            if np.count_nonzero(hit) <= DENSE * hit.size:
+                # Quiet enough to go back to blocks: the same edge/corner
+                # test as _activate(), for every block at once.
+                last_r = np.minimum(np.arange(1, brows + 1) * b, self.rows) - 1
+                last_c = np.minimum(np.arange(1, bcols + 1) * b, self.cols) - 1
+                top, bottom = grid[::b], grid[last_r]
+                left, right = grid[:, ::b], grid[:, last_c]
+                nxt = hit.copy()
+                for dr, dc, edge in (
+                    (-1, 0, across(top)),
+                    (1, 0, across(bottom)),
+                    (0, -1, down(left)),
+                    (0, 1, down(right)),
+                    (-1, -1, top[:, ::b]),
+                    (-1, 1, top[:, last_c]),
+                    (1, -1, bottom[:, ::b]),
+                    (1, 1, bottom[:, last_c]),
+                ):
+                    self._spread(nxt, edge, dr, dc)
+                self.active = nxt
+                self.block_revs[hit] = self.revision
+                self.flat[:-1] = new.ravel()
+                self.cells = self.flat[:-1].reshape(self.rows, self.cols)
+                return out
+
+        self.active[:] = True
+        self.block_revs[:] = self.revision
+        return out
+
+    def _padded(self) -> np.ndarray:
+        p = self._pad
+        p[1:-1, 1:-1] = self.cells
+        if self.wrap:
+            p[0, 1:-1] = self.cells[-1]
+            p[-1, 1:-1] = self.cells[0]
+            p[:, 0] = p[:, -2]
+            p[:, -1] = p[:, 1]
+        else:
+            p[0] = p[-1] = 0
+            p[:, 0] = p[:, -1] = 0
+        return p
+
+    def _spread(self, nxt: np.ndarray, hit: np.ndarray, dr: int, dc: int) -> None:
+        """Mark nxt[r + dr, c + dc] for every hit[r, c] (across the seam when wrapping)."""
+        if self.wrap:
+            nxt |= np.roll(hit, (dr, dc), axis=(0, 1))
+            return
+        h, w = hit.shape
+        nxt[max(dr, 0):h + min(dr, 0), max(dc, 0):w + min(dc, 0)] |= \
+            hit[max(-dr, 0):h + min(-dr, 0), max(-dc, 0):w + min(-dc, 0)]
+
+    def _activate(self, bi: np.ndarray, bj: np.ndarray, changed: np.ndarray) -> None:
+        """Next active set from the stepped blocks (bi, bj) and their changed cells."""
+        b = self.block
+
+        # Changed blocks plus neighbors across changed edges/corners.
+        nxt = np.zeros_like(self.active)
+        any_change = changed.any(axis=(1, 2))
+        nxt[bi[any_change], bj[any_change]] = True
+        self.block_revs[bi[any_change], bj[any_change]] = self.revision
+
+        # Last real row/col of a partial edge block is its bottom/right edge.
+        k = np.arange(bi.size)
+        last_r = np.minimum(b, self.rows - bi * b) - 1
+        last_c = np.minimum(b, self.cols - bj * b) - 1
+        top = changed[:, 0, :]
+        bottom = changed[k, last_r, :]
+        left = changed[:, :, 0]
+        right = changed[k, :, last_c]
+
+        edges = (
+            (-1, 0, top.any(axis=1)),
+            (1, 0, bottom.any(axis=1)),
+            (0, -1, left.any(axis=1)),
+            (0, 1, right.any(axis=1)),
+            (-1, -1, top[:, 0]),
+            (-1, 1, top[k, last_c]),
+            (1, -1, bottom[:, 0]),
+            (1, 1, bottom[k, last_c]),
+        )
+        for dr, dc, hit in edges:
+            nr = bi[hit] + dr
+            nc = bj[hit] + dc
+            if self.wrap:
+                nr %= self.brows
+                nc %= self.bcols
+            else:
+                ok = (nr >= 0) & (nr < self.brows) & (nc >= 0) & (nc < self.bcols)
+                nr, nc = nr[ok], nc[ok]
+            nxt[nr, nc] = True
+
+        self.active = nxt
@@ -0,0 +1,222 @@
+"""
+Benchmark suite: generations/sec across board sizes, densities, wrap modes and engines.
+
+    python bench.py --out bench.json
+    python bench.py --sizes 100 1000 --engines tiles numpy active --min-time 0.2
+    python bench.py --sizes 1000 2000 --densities 0.22 --engines numpy active --settle 3000
+
+Results are written as JSON so runs can be diffed between releases. The
+"tiles" engine is the original object-per-Tile path from creatures.py; it is
+only run up to --max-tile-cells because it needs hundreds of bytes per cell.
+With --settle N every soup is first run N generations (by the numpy engine),
+so engines are timed on a board of still lifes and oscillators rather than a
+fresh soup.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import engine
+
+DEFAULT_SIZES = [100, 1000, 4000]
+DEFAULT_DENSITIES = [0.05, 0.22, 0.5]
+DEFAULT_ENGINES = ["tiles", "numpy", "bitboard", "active", "parallel"]
+
+
+class TileRunner:
+    """Engine-shaped wrapper around creatures.Tile so it can be timed like the others."""
+
+    name = "tiles"
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True):
+        # Imported here: creatures pulls in pygame, which the array engines don't need.
+        import creatures
+
+        self._creatures = creatures
+        self.layout = SimpleNamespace(cols=cols, rows=rows, board_x=0, board_y=0, tile=1)
+        self.tiles: list = []
+        creatures.create_tiles(self.layout, self.tiles)
+        creatures.link_neighbors(self.layout, self.tiles, wrap=wrap)
+
+    def load_array(self, cells: np.ndarray) -> None:
+        engine.array_to_tiles(cells, self.tiles)
+
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            for t in self.tiles:
+                t.compute_next()
+            for t in self.tiles:
+                t.apply_next()
+
+    def close(self) -> None:
+        pass
+
+
+def make_runner(name: str, cols: int, rows: int, wrap: bool):
+    if name == "tiles":
+        return TileRunner(cols, rows, wrap=wrap)
+    return engine.make_engine(name, cols, rows, wrap=wrap)
+
+
+def soup(cols: int, rows: int, density: float, seed: int, wrap: bool = True, settle: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    cells = (rng.random((rows, cols)) < density).astype(np.uint8)
+    if settle:
+        ref = engine.ArrayEngine(cols, rows, wrap=wrap)
+        ref.load_array(cells)
+        ref.step(settle)
+        cells = ref.to_array()
+    return cells
+
+
+def time_steps(runner, min_time: float, max_generations: int) -> tuple[int, float]:
+    """Step in doubling batches until min_time has passed; returns (generations, seconds)."""
+    runner.step(1)  # warm-up (caches, worker start-up, first allocation)
+
+    gens = 0
+    elapsed = 0.0
+    batch = 1
+    while elapsed < min_time and gens < max_generations:
+        batch = min(batch, max_generations - gens)
+        t0 = time.perf_counter()
+        runner.step(batch)
+        elapsed += time.perf_counter() - t0
+        gens += batch
+        batch *= 2
+    return gens, elapsed
+
+
+def bench_startup(size: int, max_tile_cells: int) -> dict:
+    """
+    Cost of building the Tile graph (create_tiles + link_neighbors) per wrap
+    mode, against creating an array-backed creatures.Board and toggling wrap.
+    """
+    import creatures
+
+    out = {"size": size}
+    layout = SimpleNamespace(cols=size, rows=size, board_x=0, board_y=0, tile=1)
+
+    t0 = time.perf_counter()
+    board = creatures.Board(layout, engine.ArrayEngine(size, size))
+    out["board_s"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    board.set_wrap(not board.wrap)
+    out["board_wrap_toggle_s"] = time.perf_counter() - t0
+
+    if size * size > max_tile_cells:
+        out["skipped"] = f"Tile graph: more than {max_tile_cells} cells"
+        return out
+
+    tiles: list = []
+
+    t0 = time.perf_counter()
+    creatures.create_tiles(layout, tiles)
+    out["create_tiles_s"] = time.perf_counter() - t0
+
+    for wrap in (True, False):
+        t0 = time.perf_counter()
+        creatures.link_neighbors(layout, tiles, wrap=wrap)
+        out[f"link_neighbors_{'wrap' if wrap else 'bounded'}_s"] = time.perf_counter() - t0
+    return out
+
+
+def bench_case(name: str, size: int, density: float, wrap: bool, seed: int,
+               min_time: float, max_generations: int, settle: int = 0) -> dict:
+    case = {"engine": name, "size": size, "density": density, "wrap": wrap, "seed": seed, "settle": settle}
+    start = soup(size, size, density, seed, wrap, settle)
+
+    t0 = time.perf_counter()
+    runner = make_runner(name, size, size, wrap)
+    runner.load_array(start)
+    case["startup_s"] = time.perf_counter() - t0
+
+    try:
+        gens, elapsed = time_steps(runner, min_time, max_generations)
+    finally:
+        runner.close()
+
+    case["generations"] = gens
+    case["seconds"] = elapsed
+    case["gens_per_sec"] = gens / elapsed if elapsed else 0.0
+    case["cell_updates_per_sec"] = gens * size * size / elapsed if elapsed else 0.0
+    return case
+
+
+def run_suite(args: argparse.Namespace) -> dict:
+    results = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "min_time": args.min_time,
+            "max_generations": args.max_generations,
+            "seed": args.seed,
+            "settle": args.settle,
+        },
+        "startup": [],
+        "cases": [],
+    }
+
+    if "tiles" in args.engines:
+        # Tile graph vs array-backed Board start-up
+        for size in args.sizes:
+            r = bench_startup(size, args.max_tile_cells)
+            results["startup"].append(r)
+            log(f"startup {size}x{size}: {r}")
+
+    for size in args.sizes:
+        for density in args.densities:
+            for wrap in (True, False):
+                for name in args.engines:
+                    if name == "tiles" and size * size > args.max_tile_cells:
+                        continue
+                    case = bench_case(name, size, density, wrap, args.seed,
+                                      args.min_time, args.max_generations, args.settle)
+                    results["cases"].append(case)
+                    log(f"{name:>9} {size:>5}^2 p={density:<4} {'wrap' if wrap else 'bounded':<7} "
+                        f"{case['gens_per_sec']:10.1f} gen/s  {case['cell_updates_per_sec'] / 1e6:9.1f} Mcell/s")
+    return results
+
+
+def log(msg: str) -> None:
+    print(msg, file=sys.stderr, flush=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Game of Life engine benchmarks.")
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="square board sides")
+    ap.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES)
+    ap.add_argument("--engines", nargs="+", default=DEFAULT_ENGINES,
+                    choices=["tiles"] + list(engine.ENGINES))
+    ap.add_argument("--min-time", type=float, default=0.5, help="seconds of stepping per case")
+    ap.add_argument("--max-generations", type=int, default=10_000)
+    ap.add_argument("--max-tile-cells", type=int, default=250_000,
+                    help="skip the Tile path above this many cells")
+    ap.add_argument("--seed", type=int, default=12345)
+    ap.add_argument("--settle", type=int, default=0,
+                    help="run each soup this many generations before timing it (default 0)")
+    ap.add_argument("--out", help="write JSON results here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    results = run_suite(args)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
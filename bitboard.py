@@ -0,0 +1,185 @@
+import numpy as np
+
+import rules
+from engine import Engine
+
+WORD = 64
+
+_ONE = np.uint64(1)
+_HI = np.uint64(WORD - 1)
+
+
+def pack_rows(cells: np.ndarray) -> np.ndarray:
+    """(rows, cols) 0/1 array -> (rows, words) uint64; bit i of word w is column w*64 + i."""
+    rows, cols = cells.shape
+    words = (cols + WORD - 1) // WORD
+    padded = np.zeros((rows, words * WORD), dtype=np.uint8)
+    padded[:, :cols] = cells != 0
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def popcount(bits: np.ndarray) -> int:
+    raw = np.ascontiguousarray(bits.astype("<u8")).view(np.uint8)
+    return int(np.unpackbits(raw).sum())
+
+
+def unpack_rows(bits: np.ndarray, cols: int) -> np.ndarray:
+    """Inverse of pack_rows()."""
+    raw = np.ascontiguousarray(bits.astype("<u8")).view(np.uint8)
+    return np.unpackbits(raw, axis=1, bitorder="little")[:, :cols]
+
+
+class BitboardEngine(Engine):
+    """
+    Each row is stored as packed 64-bit words and a generation is computed with
+    bit-sliced adders, so every numpy operation advances 64 cells at once.
+
+    Conway has a shortcut that needs only the low bits of the count; other
+    two-state rules take the full 4-bit count and match it against the
+    rule's birth and survival counts, one bit plane comparison per count.
+    """
+
+    name = "bitboard"
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True):
+        super().__init__(cols, rows, wrap)
+        self.words = (cols + WORD - 1) // WORD
+        self.bits = np.zeros((rows, self.words), dtype=np.uint64)
+
+        # Padding bits past the last column must stay zero.
+        tail = cols - (self.words - 1) * WORD
+        self.tail_mask = np.uint64((1 << tail) - 1)
+        self.tail_bit = np.uint64(tail - 1)
+
+    # --- conversion ---
+    def to_array(self) -> np.ndarray:
+        return unpack_rows(self.bits, self.cols)
+
+    def _load(self, cells: np.ndarray) -> None:
+        self.bits = pack_rows(np.asarray(cells).reshape(self.rows, self.cols))
+
+    def region(self, x0: int, y0: int, w: int, h: int) -> np.ndarray:
+        # Only the rows inside the region are unpacked
+        out = np.zeros((h, w), dtype=np.uint8)
+        ax, ay = max(x0, 0), max(y0, 0)
+        bx, by = min(x0 + w, self.cols), min(y0 + h, self.rows)
+        if ax < bx and ay < by:
+            out[ay - y0:by - y0, ax - x0:bx - x0] = unpack_rows(self.bits[ay:by], self.cols)[:, ax:bx]
+        return out
+
+    def get(self, col: int, row: int) -> bool:
+        w, b = divmod(col, WORD)
+        return bool((int(self.bits[row, w]) >> b) & 1)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        w, b = divmod(col, WORD)
+        mask = np.uint64(1 << b)
+        if alive:
+            self.bits[row, w] |= mask
+        else:
+            self.bits[row, w] &= ~mask
+
+    def count_population(self) -> int:
+        return popcount(self.bits)
+
+    def _apply_rule(self, x: np.ndarray, planes: tuple) -> np.ndarray:
+        """Next state from the bit planes of the neighbor count (ones first)."""
+        def count_is(k: int) -> np.ndarray:
+            m = ~np.zeros_like(x)
+            for i, plane in enumerate(planes):
+                m &= plane if (k >> i) & 1 else ~plane
+            return m
+
+        nxt = np.zeros_like(x)
+        for k in self.rule.birth | self.rule.survive:
+            if k in self.rule.birth and k in self.rule.survive:
+                nxt |= count_is(k)
+            elif k in self.rule.birth:
+                nxt |= count_is(k) & ~x
+            else:
+                nxt |= count_is(k) & x
+        return nxt
+
+    # --- neighbors ---
+    def _west(self, x: np.ndarray) -> np.ndarray:
+        """Every cell gets the value of its left neighbor."""
+        carry = np.zeros_like(x)
+        carry[:, 1:] = x[:, :-1] >> _HI
+        if self.wrap:
+            carry[:, 0] = (x[:, -1] >> self.tail_bit) & _ONE
+        return (x << _ONE) | carry
+
+    def _east(self, x: np.ndarray) -> np.ndarray:
+        """Every cell gets the value of its right neighbor."""
+        out = x >> _ONE
+        out[:, :-1] |= x[:, 1:] << _HI
+        if self.wrap:
+            out[:, -1] |= (x[:, 0] & _ONE) << self.tail_bit
+        return out
+
+    def _north(self, x: np.ndarray) -> np.ndarray:
+        """Every row gets the row above it."""
+        if self.wrap:
+            return np.roll(x, 1, axis=0)
+        out = np.zeros_like(x)
+        out[1:] = x[:-1]
+        return out
+
+    def _south(self, x: np.ndarray) -> np.ndarray:
+        """Every row gets the row below it."""
+        if self.wrap:
+            return np.roll(x, -1, axis=0)
+        out = np.zeros_like(x)
+        out[:-1] = x[1:]
+        return out
+
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            x = self.bits
+            w = self._west(x)
+            e = self._east(x)
+
+            # Horizontal sums: (low, high) bit planes
+            we_lo = w ^ e
+            we_hi = w & e
+            row_lo = we_lo ^ x
+            row_hi = we_hi | (we_lo & x)
+
+            up_lo, up_hi = self._north(row_lo), self._north(row_hi)
+            dn_lo, dn_hi = self._south(row_lo), self._south(row_hi)
+
+            # Ones column: full adder over (up, mid, down)
+            s0 = up_lo ^ we_lo ^ dn_lo
+            c0 = (up_lo & we_lo) | (dn_lo & (up_lo ^ we_lo))
+
+            # Twos column: three highs plus the carry
+            t1 = up_hi ^ we_hi ^ dn_hi
+            t2 = (up_hi & we_hi) | (dn_hi & (up_hi ^ we_hi))
+            s1 = t1 ^ c0
+
+            if self.rule == rules.CONWAY:
+                # Count is 2 or 3 exactly when the twos bit is set and nothing spilled
+                # into the fours column (if s1 is set, t1 and c0 cannot both be set).
+                two_or_three = s1 & ~t2
+
+                # 3 -> alive, 2 -> keep current state
+                nxt = two_or_three & (s0 | x)
+            else:
+                # Fours and eights columns: t2 plus the twos column's carry
+                c1 = t1 & c0
+                nxt = self._apply_rule(x, (s0, s1, t2 ^ c1, t2 & c1))
+            nxt[:, -1] &= self.tail_mask
+            self.bits = nxt
+            self._record(popcount(nxt & ~x), popcount(x & ~nxt))
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Flipped bits come from XORing the generations; only their rows are unpacked.
+        x = self.bits
+        self.step()
+        diff = x ^ self.bits
+        rows = np.flatnonzero(diff.any(axis=1))
+        at = np.flatnonzero(unpack_rows(diff[rows], self.cols).view(bool))
+        new = unpack_rows(self.bits[rows], self.cols).ravel()[at]
+        r, xs = np.divmod(at, self.cols)
+        return xs, rows[r], 1 - new, new
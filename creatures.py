@@ -1,5 +1,25 @@
+from collections.abc import Sequence
+from typing import Optional
+
 import pygame
 import vars
+import engine
+import gameboard
+import rules
+
+
+def draw_cell(surf: pygame.Surface, layout: vars.Layout, x: int, y: int, alive: bool, hover: bool) -> None:
+    if hover:
+        color = vars.CELL_HOVER
+    else:
+        color = vars.CELL_ALIVE if alive else vars.CELL_DEAD
+
+    pygame.draw.rect(surf, color, (x, y, layout.tile, layout.tile))
+
+    # subtle inner sheen on alive cells
+    if alive and not hover:
+        inner = pygame.Rect(x + 2, y + 2, layout.tile - 4, layout.tile - 4)
+        pygame.draw.rect(surf, (255, 255, 255, 20), inner, width=1, border_radius=4)
 
 
 class Tile:
@@ -16,17 +36,7 @@ class Tile:
         self.neighbors: list["Tile"] = []
 
     def draw(self, surf: pygame.Surface, layout: vars.Layout) -> None:
-        if self.hover:
-            color = vars.CELL_HOVER
-        else:
-            color = vars.CELL_ALIVE if self.alive else vars.CELL_DEAD
-
-        pygame.draw.rect(surf, color, (self.x, self.y, layout.tile, layout.tile))
-
-        # subtle inner sheen on alive cells
-        if self.alive and not self.hover:
-            inner = pygame.Rect(self.x + 2, self.y + 2, layout.tile - 4, layout.tile - 4)
-            pygame.draw.rect(surf, (255, 255, 255, 20), inner, width=1, border_radius=4)
+        draw_cell(surf, layout, self.x, self.y, self.alive, self.hover)
 
     def set_hover(self, mx: int, my: int, layout: vars.Layout) -> None:
         self.hover = (self.x <= mx < self.x + layout.tile) and (self.y <= my < self.y + layout.tile)
@@ -39,17 +49,12 @@ class Tile:
         if right_clicked and self.hover:
             self.alive = False
 
-    def compute_next(self) -> None:
+    def compute_next(self, rule: rules.Rule = rules.CONWAY) -> None:
         n = 0
         for t in self.neighbors:
             if t.alive:
                 n += 1
-
-        # Conway rules
-        if self.alive:
-            self.next_alive = (n == 2 or n == 3)
-        else:
-            self.next_alive = (n == 3)
+        self.next_alive = n in (rule.survive if self.alive else rule.birth)
 
     def apply_next(self) -> None:
         self.alive = self.next_alive
@@ -102,6 +107,185 @@ def randomize(tiles: list[Tile], p: float = 0.22) -> None:
         t.alive = (random.random() < p)
 
 
+# ----------------------------
+# Array-backed board
+# ----------------------------
+class Board:
+    """
+    The board as the engine's contiguous cell array plus layout geometry.
+
+    There is no per-cell object and no neighbor graph: positions and neighbors
+    are computed from (col, row), so construction costs nothing per cell and
+    toggling wrap is O(1). Code written against list[Tile] can use board.tiles.
+    """
+
+    def __init__(self, layout: vars.Layout, sim: engine.Engine,
+                 viewport: Optional[gameboard.Viewport] = None):
+        self.layout = layout
+        self.sim = sim
+        # Set for unbounded engines and boards larger than the board area:
+        # the board area then shows a pannable, zoomable window.
+        self.viewport = viewport
+        self.hover = None  # (col, row) under the mouse, or None
+        self.tiles = TileList(self)
+
+    @property
+    def cols(self) -> int:
+        return self.sim.cols
+
+    @property
+    def rows(self) -> int:
+        return self.sim.rows
+
+    @property
+    def wrap(self) -> bool:
+        return self.sim.wrap
+
+    def set_wrap(self, wrap: bool) -> None:
+        self.sim.set_wrap(wrap)
+
+    @property
+    def cells(self):
+        return self.sim.to_array()
+
+    def tile(self, col: int, row: int) -> "TileView":
+        return TileView(self, col, row)
+
+    def cell_at(self, mx: int, my: int):
+        if self.viewport is None:
+            return gameboard.cell_at(self.layout, mx, my)
+        cell = self.viewport.cell_at(mx, my)
+        if cell is not None and not self.sim.unbounded:
+            if not (0 <= cell[0] < self.cols and 0 <= cell[1] < self.rows):
+                return None
+        return cell
+
+    def cell_xy(self, col: int, row: int) -> tuple[int, int]:
+        """Screen position of a cell's top-left corner."""
+        lay = self.layout
+        if self.viewport is not None:
+            vp = self.viewport
+            return (lay.board_x + (col - vp.x0) // vp.block * vp.tile,
+                    lay.board_y + (row - vp.y0) // vp.block * vp.tile)
+        return lay.board_x + col * lay.tile, lay.board_y + row * lay.tile
+
+    def visible_cells(self):
+        """
+        (rows, cols) array of what the board area shows: cell states, or live
+        counts per block when the viewport is zoomed out past one cell per pixel.
+        """
+        vp = self.viewport
+        if vp is None:
+            return self.sim.to_array()
+        if vp.block > 1:
+            return self.sim.region_density(vp.x0, vp.y0, vp.cols, vp.rows, vp.block)
+        return self.sim.region(vp.x0, vp.y0, vp.cols, vp.rows)
+
+    def neighbors(self, col: int, row: int) -> list[tuple[int, int]]:
+        """Same cells, in the same order, as link_neighbors() would have linked."""
+        out = []
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dc == 0 and dr == 0:
+                    continue
+
+                nc = col + dc
+                nr = row + dr
+
+                if self.wrap:
+                    out.append((nc % self.cols, nr % self.rows))
+                elif 0 <= nc < self.cols and 0 <= nr < self.rows:
+                    out.append((nc, nr))
+        return out
+
+    def step(self, n: int = 1) -> None:
+        self.sim.step(n)
+
+    def clear(self) -> None:
+        self.sim.clear()
+
+    def randomize(self, p: float = 0.22) -> None:
+        self.sim.randomize(p)
+
+
+class TileView:
+    """
+    Tile-compatible handle onto one cell of a Board. It only stores (board, col,
+    row); x, y, alive, hover and neighbors are derived on access. Stepping is
+    done by the board, so there is no compute_next/apply_next.
+    """
+
+    __slots__ = ("board", "col", "row")
+
+    def __init__(self, board: Board, col: int, row: int):
+        self.board = board
+        self.col = col
+        self.row = row
+
+    @property
+    def x(self) -> int:
+        return self.board.cell_xy(self.col, self.row)[0]
+
+    @property
+    def y(self) -> int:
+        return self.board.cell_xy(self.col, self.row)[1]
+
+    @property
+    def alive(self) -> bool:
+        return self.board.sim.get(self.col, self.row)
+
+    @alive.setter
+    def alive(self, value: bool) -> None:
+        self.board.sim.set(self.col, self.row, bool(value))
+
+    @property
+    def hover(self) -> bool:
+        return self.board.hover == (self.col, self.row)
+
+    @property
+    def neighbors(self) -> list["TileView"]:
+        return [TileView(self.board, c, r) for c, r in self.board.neighbors(self.col, self.row)]
+
+    def draw(self, surf: pygame.Surface, layout: vars.Layout) -> None:
+        draw_cell(surf, layout, self.x, self.y, self.alive, self.hover)
+
+    def set_hover(self, mx: int, my: int, layout: vars.Layout) -> None:
+        inside = (self.x <= mx < self.x + layout.tile) and (self.y <= my < self.y + layout.tile)
+        if inside:
+            self.board.hover = (self.col, self.row)
+        elif self.hover:
+            self.board.hover = None
+
+    def toggle_if_clicked(self, clicked: bool) -> None:
+        if clicked and self.hover:
+            self.alive = not self.alive
+
+    def erase_if_right_click(self, right_clicked: bool) -> None:
+        if right_clicked and self.hover:
+            self.alive = False
+
+
+class TileList(Sequence):
+    """Row-major, read-only sequence of TileViews (what create_tiles() used to build)."""
+
+    def __init__(self, board: Board):
+        self.board = board
+
+    def __len__(self) -> int:
+        return self.board.cols * self.board.rows
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("tile index out of range")
+        row, col = divmod(i, self.board.cols)
+        return TileView(self.board, col, row)
+
+
 # import pygame
 # import vars
 
@@ -0,0 +1,139 @@
+"""
+Cycle and still-life detection by incremental (Zobrist) hashing.
+
+The hash of a board is the XOR of a pseudo-random 64-bit key per live cell.
+Flipping a cell XORs its key in or out, so after each generation the hash is
+updated from the cells that changed only. Under Generations rules the key
+also depends on the cell's state (state 1 keys are the two-state keys).
+Recent hashes are kept in a bounded history; when one comes back, the board
+has entered a cycle.
+"""
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_HISTORY = 4096
+
+_M1 = np.uint64(0x9E3779B97F4A7C15)
+_M2 = np.uint64(0xC2B2AE3D27D4EB4F)
+_M3 = np.uint64(0xBF58476D1CE4E5B9)
+_M4 = np.uint64(0x94D049BB133111EB)
+_M5 = np.uint64(0xD6E8FEB86659FD93)
+
+
+def zobrist_keys(xs: np.ndarray, ys: np.ndarray, seed: int = 0, states=None) -> np.ndarray:
+    """
+    Key of each cell (xs[i], ys[i]), computed from its coordinates (splitmix64),
+    so there is no per-cell table and unbounded boards work the same way.
+    With states, the key is for that state, and empty (state 0) cells get 0.
+    """
+    x = np.asarray(xs, dtype=np.int64).astype(np.uint64)
+    y = np.asarray(ys, dtype=np.int64).astype(np.uint64)
+    z = (x * _M1) ^ (y * _M2) ^ np.uint64(seed)
+    if states is not None:
+        s = np.asarray(states).astype(np.uint64)
+        z ^= (s - np.uint64(1)) * _M5
+    z = (z ^ (z >> np.uint64(30))) * _M3
+    z = (z ^ (z >> np.uint64(27))) * _M4
+    z ^= z >> np.uint64(31)
+    if states is not None:
+        z[s == 0] = 0
+    return z
+
+
+def xor_keys(xs: np.ndarray, ys: np.ndarray, seed: int = 0, states=None) -> int:
+    if len(xs) == 0:
+        return 0
+    return int(np.bitwise_xor.reduce(zobrist_keys(xs, ys, seed, states)))
+
+
+class CycleDetector:
+    """
+    Tracks the board hash generation by generation.
+
+    Call reset() whenever the board is replaced, toggle() when one cell is
+    edited, and advance() after each generation with the cells that flipped.
+    Once a hash repeats, period is the cycle length (1 = still life, which
+    includes an empty board) and since is the generation the cycle was
+    first seen at.
+    """
+
+    def __init__(self, history: int = DEFAULT_HISTORY, seed: int = 0):
+        self.seed = seed
+        self.hash = 0
+        self.seen: dict[int, int] = {}  # hash -> latest generation with it
+        self.order: deque = deque(maxlen=history)  # (hash, generation), oldest first
+        self.period: Optional[int] = None
+        self.since: Optional[int] = None
+
+    def _forget(self) -> None:
+        self.seen.clear()
+        self.order.clear()
+        self.period = None
+        self.since = None
+
+    def _record(self, generation: int) -> Optional[int]:
+        prev = self.seen.get(self.hash)
+        if prev is not None and self.period is None:
+            self.period = generation - prev
+            self.since = prev
+
+        if len(self.order) == self.order.maxlen:
+            h, g = self.order[0]
+            if self.seen.get(h) == g:
+                del self.seen[h]
+        self.order.append((self.hash, generation))
+        self.seen[self.hash] = generation
+        return self.period
+
+    def reset(self, xs: np.ndarray, ys: np.ndarray, generation: int, states=None) -> None:
+        """Full rehash of the live cells (xs, ys) (in states, if given); the history starts over."""
+        self.hash = xor_keys(xs, ys, self.seed, states)
+        self._forget()
+        self._record(generation)
+
+    def toggle(self, x: int, y: int, generation: int, old: int = 0, new: int = 1) -> None:
+        """One cell was painted or erased (from state old to new); the history no longer applies."""
+        xs, ys = np.array([x]), np.array([y])
+        self.hash ^= xor_keys(xs, ys, self.seed, [old]) ^ xor_keys(xs, ys, self.seed, [new])
+        self._forget()
+        self._record(generation)
+
+    def advance(self, xs: np.ndarray, ys: np.ndarray, generation: int,
+                old=None, new=None) -> Optional[int]:
+        """
+        One generation stepped and cells (xs, ys) flipped (from states old to
+        new, if given; see Engine.changes); returns the period once in a cycle.
+        """
+        # A cell flipping between 0 and 1 XORs its two-state key either way.
+        if old is None or max(np.max(old, initial=0), np.max(new, initial=0)) <= 1:
+            self.hash ^= xor_keys(xs, ys, self.seed)
+        else:
+            self.hash ^= xor_keys(xs, ys, self.seed, old) ^ xor_keys(xs, ys, self.seed, new)
+        return self._record(generation)
+
+    def steps_to(self, generation: int, target: int) -> int:
+        """Generations to actually step from generation to reach target's state (needs a period)."""
+        return (target - generation) % self.period
+
+    def fast_forward(self, sim, target: int) -> None:
+        """
+        Bring sim (an engine in the detected cycle) to generation target by
+        stepping only (target - generation) mod period generations.
+        """
+        sim.step(self.steps_to(sim.stats.generation, target))
+        sim.stats.generation = target
+
+        # Same cycle, new generation numbers
+        period, since = self.period, self.since
+        xs, ys, states = sim.live_cells()
+        self.reset(xs, ys, target, states)
+        self.period, self.since = period, since
+
+    def describe(self) -> str:
+        if self.period is None:
+            return "none seen"
+        kind = "still life" if self.period == 1 else f"period {self.period}"
+        return f"{kind} since gen {self.since}"
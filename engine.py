@@ -0,0 +1,388 @@
+import importlib
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+import rules
+from rules import Rule
+
+
+# ----------------------------
+# Array helpers (no pygame here)
+# ----------------------------
+def array_from_tiles(tiles, cols: int, rows: int) -> np.ndarray:
+    """Pack the alive flags of a row-major Tile list into a (rows, cols) uint8 array."""
+    flat = np.fromiter((t.alive for t in tiles), dtype=np.uint8, count=cols * rows)
+    return flat.reshape(rows, cols)
+
+
+def array_to_tiles(cells: np.ndarray, tiles) -> None:
+    """Write a (rows, cols) array back into the alive flags of a row-major Tile list."""
+    for t, v in zip(tiles, cells.ravel().tolist()):
+        t.alive = bool(v)
+
+
+def counts_from_padded(p: np.ndarray) -> np.ndarray:
+    """Live neighbor counts of the interior of a 0/1 array that already has a one-cell halo."""
+    h, w = p.shape[-2] - 2, p.shape[-1] - 2
+
+    n = np.zeros(p.shape[:-2] + (h, w), dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr == 1 and dc == 1:
+                continue
+            n += p[..., dr:dr + h, dc:dc + w]
+    return n
+
+
+def neighbor_counts(cells: np.ndarray, wrap: bool = True) -> np.ndarray:
+    """
+    Count live neighbors of every cell with eight shifted sums.
+    If wrap=True, the grid wraps at edges (toroidal topology).
+    If wrap=False, cells outside the board count as dead (bounded grid).
+    """
+    return counts_from_padded(np.pad(cells, 1, mode="wrap" if wrap else "constant"))
+
+
+def step_padded(p: np.ndarray, rule: Rule = rules.CONWAY) -> np.ndarray:
+    """Next generation of the interior of a halo-padded array (leading axes are a batch)."""
+    if rule.states == 2:
+        n = counts_from_padded(p)
+        return rules.next_alive(rule, n, p[..., 1:-1, 1:-1].view(bool))
+
+    # Generations: only state 1 is alive; live cells that do not survive
+    # start dying, and dying cells age by one state until they are empty.
+    n = counts_from_padded((p == 1).view(np.uint8))
+    cells = p[..., 1:-1, 1:-1]
+    nxt = rules.next_alive(rule, n, cells == 1)
+    aged = ((cells.astype(np.uint16) + 1) % rule.states).astype(np.uint8)
+    return np.where(cells == 0, nxt, np.where(cells == 1, 2 - nxt, aged))
+
+
+def life_step(cells: np.ndarray, wrap: bool = True, rule: Rule = rules.CONWAY) -> np.ndarray:
+    return step_padded(np.pad(cells, 1, mode="wrap" if wrap else "constant"), rule)
+
+
+def array_changes(old: np.ndarray, new: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(xs, ys, old states, new states) of the cells where two boards of the same shape differ."""
+    at = np.flatnonzero(old != new)
+    ys, xs = np.divmod(at, old.shape[-1])
+    return xs, ys, old.ravel()[at], new.ravel()[at]
+
+
+def block_sum(cells: np.ndarray, block: int) -> np.ndarray:
+    """Live cells in each block x block square; shape must be a multiple of block."""
+    h, w = cells.shape
+    return (cells == 1).reshape(h // block, block, w // block, block).sum(axis=(1, 3), dtype=np.uint16)
+
+
+# ----------------------------
+# Engines
+# ----------------------------
+# region_density() caches block sums per TILE x TILE square of a bounded board
+TILE = 64
+
+
+@dataclass
+class Stats:
+    """Counters the engine keeps up to date as it steps and is edited; reading them is free."""
+
+    generation: int = 0
+    population: int = 0
+
+    # Last generation
+    births: int = 0
+    deaths: int = 0
+
+    # Since the last clear/randomize
+    total_births: int = 0
+    total_deaths: int = 0
+
+
+class Engine:
+    """
+    Common interface for simulation engines.
+
+    Subclasses store the board however they like and implement to_array(),
+    _load() and step(); everything else is built on top of those. step() must
+    call _record() once per generation so the stats stay current.
+
+    revision goes up whenever the cells may have changed (each generation and
+    each edit), so anything derived from the board can tell it is stale.
+
+    Cells hold a state: 0 empty, 1 alive, and under Generations rules 2 and
+    up for dying cells, which are neither alive nor counted in the population.
+    """
+
+    name = "base"
+    # True for engines on the infinite plane that provide region(x0, y0, w, h);
+    # the UI then shows them through a pan/zoom viewport.
+    unbounded = False
+    # False for engines whose board has no edges to wrap (set_wrap() does nothing)
+    wraps = True
+    # Which rules step() can run (see supports())
+    generations = False  # rules with more than two states
+    birth_on_zero = True  # rules with B0, which wake empty space
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True):
+        self.cols = cols
+        self.rows = rows
+        self.wrap = wrap
+        self.rule = rules.CONWAY
+        self.stats = Stats()
+        self.revision = 0
+        # (block, tile revisions summed, block sums) behind region_density()
+        self._tile_sums: Optional[tuple[int, np.ndarray, np.ndarray]] = None
+
+    def to_array(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def _load(self, cells: np.ndarray) -> None:
+        raise NotImplementedError
+
+    def step(self, n: int = 1) -> None:
+        raise NotImplementedError
+
+    def load_array(self, cells: np.ndarray) -> None:
+        """Replace the board. The generation number and totals are kept."""
+        self.revision += 1
+        self._load(cells)
+        self.stats.population = self.count_population()
+        self.stats.births = 0
+        self.stats.deaths = 0
+
+    def set_wrap(self, wrap: bool) -> None:
+        self.wrap = wrap
+
+    @classmethod
+    def supports(cls, rule: Rule) -> bool:
+        """Whether step() can run rule (a class attribute check; no engine needed)."""
+        return ((rule.states == 2 or cls.generations)
+                and (0 not in rule.birth or cls.birth_on_zero))
+
+    def set_rule(self, rule: Rule) -> None:
+        """Step by rule from now on; dying cells are cleared when it has only two states."""
+        if not self.supports(rule):
+            raise ValueError(f"the {self.name} engine cannot run {rule}")
+        if self.rule.states > 2 and rule.states == 2:
+            self.revision += 1
+            self._drop_dying()
+        self.rule = rule
+
+    def _drop_dying(self) -> None:
+        self._load((self.to_array() == 1).view(np.uint8))
+
+    def get(self, col: int, row: int) -> bool:
+        return bool(self.to_array()[row, col] == 1)
+
+    def set(self, col: int, row: int, alive: bool) -> None:
+        if self.get(col, row) == alive:
+            return
+        self.revision += 1
+        self._put(col, row, alive)
+        self.stats.population += 1 if alive else -1
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        cells = self.to_array().copy()
+        cells[row, col] = 1 if alive else 0
+        self._load(cells)
+
+    def clear(self) -> None:
+        self.load_array(np.zeros((self.rows, self.cols), dtype=np.uint8))
+        self.stats = Stats()
+
+    def randomize(self, p: float = 0.22, seed=None) -> None:
+        rng = np.random.default_rng(seed)
+        self.load_array((rng.random((self.rows, self.cols)) < p).astype(np.uint8))
+        self.stats = Stats(population=self.stats.population)
+
+    def _record(self, births: int, deaths: int) -> None:
+        """Book-keeping for one generation."""
+        self.revision += 1
+        s = self.stats
+        s.generation += 1
+        s.population += births - deaths
+        s.births = births
+        s.deaths = deaths
+        s.total_births += births
+        s.total_deaths += deaths
+
+    def region(self, x0: int, y0: int, w: int, h: int) -> np.ndarray:
+        """Copy of cells [x0, x0 + w) x [y0, y0 + h) as a (h, w) array; cells off the board are dead."""
+        ax, ay = max(x0, 0), max(y0, 0)
+        bx, by = min(x0 + w, self.cols), min(y0 + h, self.rows)
+        if (ax, ay, bx, by) == (x0, y0, x0 + w, y0 + h):
+            return self.to_array()[ay:by, ax:bx].copy()
+        out = np.zeros((h, w), dtype=np.uint8)
+        if ax < bx and ay < by:
+            out[ay - y0:by - y0, ax - x0:bx - x0] = self.to_array()[ay:by, ax:bx]
+        return out
+
+    def region_density(self, x0: int, y0: int, w: int, h: int, block: int) -> np.ndarray:
+        """(h, w) live-cell counts of the block x block squares starting at world (x0, y0)."""
+        if self.unbounded:
+            return block_sum(self.region(x0, y0, w * block, h * block), block)
+        if TILE % block or x0 % block or y0 % block:
+            return self._clipped_density(x0, y0, w, h, block)
+
+        # Block sums of the whole board, kept per tile and refreshed for the
+        # visible tiles whose revision moved on since they were summed.
+        n = TILE // block
+        revs = self._tile_revisions()
+        if self._tile_sums is None or self._tile_sums[0] != block:
+            ty, tx = revs.shape
+            self._tile_sums = (block, np.full((ty, tx), -1, dtype=np.int64), np.zeros((ty * n, tx * n), dtype=np.uint16))
+        _, done, sums = self._tile_sums
+
+        tx0, ty0 = max(x0 // TILE, 0), max(y0 // TILE, 0)
+        tx1 = min(-(-(x0 + w * block) // TILE), revs.shape[1])
+        ty1 = min(-(-(y0 + h * block) // TILE), revs.shape[0])
+        if tx0 < tx1 and ty0 < ty1:
+            stale = np.argwhere(revs[ty0:ty1, tx0:tx1] != done[ty0:ty1, tx0:tx1]) + (ty0, tx0)
+            if len(stale):
+                (sy0, sx0), (sy1, sx1) = stale.min(axis=0), stale.max(axis=0) + 1
+                if 4 * len(stale) < (sy1 - sy0) * (sx1 - sx0):
+                    # A few scattered tiles: each on its own
+                    spans = [(ty, tx, ty + 1, tx + 1) for ty, tx in stale]
+                else:
+                    spans = [(sy0, sx0, sy1, sx1)]
+                for ry0, rx0, ry1, rx1 in spans:
+                    cells = self.region(rx0 * TILE, ry0 * TILE, (rx1 - rx0) * TILE, (ry1 - ry0) * TILE)
+                    sums[ry0 * n:ry1 * n, rx0 * n:rx1 * n] = block_sum(cells, block)
+                    done[ry0:ry1, rx0:rx1] = revs[ry0:ry1, rx0:rx1]
+
+        out = np.zeros((h, w), dtype=np.uint16)
+        bx, by = x0 // block, y0 // block
+        ax, ay = max(bx, 0), max(by, 0)
+        ex, ey = min(bx + w, sums.shape[1]), min(by + h, sums.shape[0])
+        if ax < ex and ay < ey:
+            out[ay - by:ey - by, ax - bx:ex - bx] = sums[ay:ey, ax:ex]
+        return out
+
+    def _clipped_density(self, x0: int, y0: int, w: int, h: int, block: int) -> np.ndarray:
+        """region_density() without the cache; only blocks that overlap the board are summed."""
+        out = np.zeros((h, w), dtype=np.uint16)
+        i0, j0 = max(-x0 // block, 0), max(-y0 // block, 0)
+        i1 = min(-(-(self.cols - x0) // block), w)
+        j1 = min(-(-(self.rows - y0) // block), h)
+        if i0 < i1 and j0 < j1:
+            cells = self.region(x0 + i0 * block, y0 + j0 * block, (i1 - i0) * block, (j1 - j0) * block)
+            out[j0:j1, i0:i1] = block_sum(cells, block)
+        return out
+
+    def _tile_revisions(self) -> np.ndarray:
+        """
+        Revision of every TILE x TILE square of the board: a square's changes
+        whenever its cells may have. Engines that only know the board-wide
+        revision report it for every square.
+        """
+        return np.full((-(-self.rows // TILE), -(-self.cols // TILE)), self.revision, dtype=np.int64)
+
+    def live_points(self) -> tuple[np.ndarray, np.ndarray]:
+        """(xs, ys) of every non-empty cell."""
+        ys, xs = np.nonzero(self.to_array())
+        return xs, ys
+
+    def live_cells(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(xs, ys, states) of every non-empty cell."""
+        cells = self.to_array()
+        ys, xs = np.nonzero(cells)
+        return xs, ys, cells[ys, xs]
+
+    def snapshot(self):
+        """Opaque copy of the current state, for flips() after stepping."""
+        return self.to_array().copy()
+
+    def changes(self, snapshot) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(xs, ys, old states, new states) of the cells that differ from snapshot."""
+        return array_changes(snapshot, self.to_array())
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        One generation, then changes() across it. Engines whose step already
+        knows what it changed override this so no snapshot is taken.
+        """
+        snap = self.snapshot()
+        self.step()
+        return self.changes(snap)
+
+    def flips(self, snapshot) -> tuple[np.ndarray, np.ndarray]:
+        """(xs, ys) of the cells that differ from snapshot."""
+        return self.changes(snapshot)[:2]
+
+    def population(self) -> int:
+        return self.stats.population
+
+    def count_population(self) -> int:
+        """Full scan; only used when the whole board is replaced."""
+        return int(np.count_nonzero(self.to_array() == 1))
+
+    def close(self) -> None:
+        """Release any external resources (worker processes, shared memory)."""
+
+    def load_tiles(self, tiles) -> None:
+        self.load_array(array_from_tiles(tiles, self.cols, self.rows))
+
+    def store_tiles(self, tiles) -> None:
+        array_to_tiles(self.to_array(), tiles)
+
+
+class ArrayEngine(Engine):
+    """Byte-per-cell board; each generation is a handful of whole-array operations."""
+
+    name = "numpy"
+    generations = True
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True):
+        super().__init__(cols, rows, wrap)
+        self.cells = np.zeros((rows, cols), dtype=np.uint8)
+
+    def to_array(self) -> np.ndarray:
+        return self.cells
+
+    def _load(self, cells: np.ndarray) -> None:
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def get(self, col: int, row: int) -> bool:
+        return bool(self.cells[row, col] == 1)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        self.cells[row, col] = 1 if alive else 0
+
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            old = self.cells
+            self.cells = life_step(old, self.wrap, self.rule)
+            self._record(*rules.births_deaths(old, self.cells, self.rule.states))
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # step() replaces the array, so the previous generation is still intact.
+        old = self.cells
+        self.step()
+        return array_changes(old, self.cells)
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+# name -> "module:Class"; imported lazily (the engine modules import this one).
+ENGINES = {
+    "numpy": "engine:ArrayEngine",
+    "bitboard": "bitboard:BitboardEngine",
+    "active": "active:ActiveEngine",
+    "parallel": "parallel:ParallelEngine",
+    "hashlife": "hashlife:HashLifeEngine",
+    "sparse": "sparse:SparseEngine",
+}
+
+
+def engine_class(name: str) -> type:
+    if name not in ENGINES:
+        raise ValueError(f"unknown engine {name!r} (choose from {', '.join(ENGINES)})")
+    module_name, cls_name = ENGINES[name].split(":")
+    return getattr(importlib.import_module(module_name), cls_name)
+
+
+def make_engine(name: str, cols: int, rows: int, wrap: bool = True, **kwargs) -> Engine:
+    return engine_class(name)(cols, rows, wrap=wrap, **kwargs)
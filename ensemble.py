@@ -0,0 +1,204 @@
+"""
+Many independent small boards stepped as one array.
+
+An Ensemble holds a stack of boards as a (batch, rows, cols) array and
+advances all of them with the same whole-array operations the numpy engine
+uses for one board, so there is no per-board Python work per generation.
+Every board has its own wrap setting and its own population, births and
+deaths.
+
+    python ensemble.py --batch 4096 --size 32x32 --generations 1000
+"""
+
+import argparse
+import json
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import life
+import rules
+from engine import ArrayEngine, step_padded
+from rules import Rule
+
+
+@dataclass
+class EnsembleStats:
+    """engine.Stats for a batch: every counter but generation is a (batch,) int64 array."""
+
+    generation: int
+    population: np.ndarray
+    births: np.ndarray
+    deaths: np.ndarray
+    total_births: np.ndarray
+    total_deaths: np.ndarray
+
+    @classmethod
+    def zeros(cls, batch: int) -> "EnsembleStats":
+        return cls(0, *(np.zeros(batch, dtype=np.int64) for _ in range(5)))
+
+
+class Ensemble:
+    """
+    batch boards of cols x rows cells. wrap is one bool for all of them or
+    one per board; stats holds per-board counters (EnsembleStats).
+    """
+
+    def __init__(self, batch: int, cols: int, rows: int, wrap=True, rule: Rule = rules.CONWAY):
+        self.batch = batch
+        self.cols = cols
+        self.rows = rows
+        self.rule = rule
+        self.cells = np.zeros((batch, rows, cols), dtype=np.uint8)
+        self.set_wrap(wrap)
+
+        # Halo-padded copy of every board, refilled each generation
+        self._pad = np.zeros((batch, rows + 2, cols + 2), dtype=np.uint8)
+        self.clear()
+
+    # --- setup ---
+    def set_wrap(self, wrap) -> None:
+        self.wrap = np.broadcast_to(np.asarray(wrap, dtype=bool), (self.batch,)).copy()
+
+    def set_rule(self, rule: Rule) -> None:
+        if self.rule.states > 2 and rule.states == 2:
+            self.cells[self.cells > 1] = 0
+        self.rule = rule
+
+    def clear(self) -> None:
+        self.cells[:] = 0
+        self.stats = EnsembleStats.zeros(self.batch)
+
+    def randomize(self, p: float = 0.22, seed=None) -> None:
+        """A fresh soup on every board (one generator, so boards differ)."""
+        rng = np.random.default_rng(seed)
+        self.cells[:] = rng.random(self.cells.shape) < p
+        self.stats = EnsembleStats.zeros(self.batch)
+        self.stats.population[:] = self.count_population()
+
+    def load(self, i: int, cells: np.ndarray) -> None:
+        """Replace board i; its totals start over."""
+        self.cells[i] = np.asarray(cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        s = self.stats
+        s.population[i] = np.count_nonzero(self.cells[i] == 1)
+        s.births[i] = s.deaths[i] = s.total_births[i] = s.total_deaths[i] = 0
+
+    def count_population(self) -> np.ndarray:
+        """Full scan, per board."""
+        return np.count_nonzero(self.cells == 1, axis=(1, 2))
+
+    # --- evolution ---
+    def _padded(self) -> np.ndarray:
+        p = self._pad
+        p[:, 1:-1, 1:-1] = self.cells
+
+        # Toroidal halo for every board, then bounded boards get a dead one
+        p[:, 0, 1:-1] = self.cells[:, -1]
+        p[:, -1, 1:-1] = self.cells[:, 0]
+        p[:, :, 0] = p[:, :, -2]
+        p[:, :, -1] = p[:, :, 1]
+        if not self.wrap.all():
+            bounded = ~self.wrap
+            p[bounded, 0, :] = 0
+            p[bounded, -1, :] = 0
+            p[bounded, :, 0] = 0
+            p[bounded, :, -1] = 0
+        return p
+
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            old = self.cells
+            self.cells = step_padded(self._padded(), self.rule)
+
+            # rules.births_deaths, per board
+            if self.rule.states == 2:
+                births = np.count_nonzero(self.cells > old, axis=(1, 2))
+                deaths = np.count_nonzero(self.cells < old, axis=(1, 2))
+            else:
+                alive, was = self.cells == 1, old == 1
+                births = np.count_nonzero(alive & ~was, axis=(1, 2))
+                deaths = np.count_nonzero(was & ~alive, axis=(1, 2))
+
+            s = self.stats
+            s.generation += 1
+            s.population += births - deaths
+            s.births, s.deaths = births, deaths
+            s.total_births += births
+            s.total_deaths += deaths
+
+
+# ----------------------------
+# Benchmark
+# ----------------------------
+def measure_throughput(batch: int, cols: int, rows: int, generations: int, wrap=True,
+                       rule: Rule = rules.CONWAY, density: float = 0.22, seed=None,
+                       compare: bool = False) -> dict:
+    """Time the ensemble (and, with compare, one ArrayEngine per board) over the same soups."""
+    ens = Ensemble(batch, cols, rows, wrap, rule)
+    ens.randomize(density, seed)
+    start = ens.cells.copy()
+
+    t0 = time.perf_counter()
+    ens.step(generations)
+    elapsed = time.perf_counter() - t0
+
+    updates = generations * batch * rows * cols
+    result = {
+        "batch": batch,
+        "cols": cols,
+        "rows": rows,
+        "rule": str(rule),
+        "wrapped_boards": int(ens.wrap.sum()),
+        "generations": generations,
+        "seconds": elapsed,
+        "cell_updates_per_sec": updates / elapsed if elapsed else 0.0,
+        "populations": ens.stats.population.tolist(),
+    }
+
+    if compare:
+        t0 = time.perf_counter()
+        identical = True
+        for i in range(batch):
+            e = ArrayEngine(cols, rows, wrap=bool(ens.wrap[i]))
+            e.set_rule(rule)
+            e.load_array(start[i])
+            e.step(generations)
+            identical &= bool((e.to_array() == ens.cells[i]).all())
+        single_s = time.perf_counter() - t0
+        result["per_board_seconds"] = single_s
+        result["speedup"] = single_s / elapsed if elapsed else 0.0
+        result["identical"] = identical
+    return result
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Step a batch of random soups as one array.")
+    ap.add_argument("--batch", type=int, default=1024, help="number of boards (default 1024)")
+    ap.add_argument("--size", type=life.parse_size, default=(32, 32), help="COLSxROWS per board (default 32x32)")
+    ap.add_argument("--generations", "-g", type=int, default=500)
+    ap.add_argument("--rule", type=life.parse_rule, default=rules.CONWAY)
+    ap.add_argument("--density", type=float, default=0.22)
+    ap.add_argument("--seed", type=int, default=None)
+    wrap = ap.add_mutually_exclusive_group()
+    wrap.add_argument("--no-wrap", action="store_true", help="every board bounded")
+    wrap.add_argument("--mixed-wrap", action="store_true", help="every other board bounded")
+    ap.add_argument("--compare", action="store_true", help="also step one numpy engine per board")
+    ap.add_argument("--stats", help="write timing and per-board populations here (JSON)")
+    args = ap.parse_args()
+
+    cols, rows = args.size
+    wrap = np.arange(args.batch) % 2 == 0 if args.mixed_wrap else not args.no_wrap
+    r = measure_throughput(args.batch, cols, rows, args.generations, wrap, args.rule,
+                           args.density, args.seed, args.compare)
+    pops = np.array(r["populations"])
+    print(f"{r['batch']} boards of {cols}x{rows} ({r['wrapped_boards']} wrapped), {args.rule.label}, "
+          f"{r['generations']} generations in {r['seconds']:.3f} s")
+    print(f"  {r['cell_updates_per_sec'] / 1e6:.1f} M cell updates/s")
+    print(f"  final population: mean {pops.mean():.1f}, min {pops.min()}, max {pops.max()}")
+    if args.compare:
+        print(f"  per-board engines: {r['per_board_seconds']:.3f} s, speedup {r['speedup']:.2f}x "
+              f"(identical: {r['identical']})")
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(r, f, indent=2)
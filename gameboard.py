@@ -1,7 +1,16 @@
+from functools import lru_cache
+from typing import Optional
+
 import pygame
 import vars
 
 
+@lru_cache(maxsize=vars.TEXT_CACHE_SIZE)
+def render_text(font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+    """font.render(text, True, color), cached; the surface is shared, so only blit it."""
+    return font.render(text, True, color)
+
+
 def _shadow_round_rect(surf: pygame.Surface, rect: pygame.Rect, radius: int = 14) -> None:
     shadow = pygame.Surface((rect.w, rect.h), pygame.SRCALPHA)
     pygame.draw.rect(shadow, vars.SHADOW_RGBA, shadow.get_rect(), border_radius=radius)
@@ -16,7 +25,7 @@ def draw_panel(surf: pygame.Surface, layout: vars.Layout) -> pygame.Rect:
     pygame.draw.rect(surf, vars.PANEL_STROKE, panel, width=1, border_radius=16)
 
     # Title
-    title = layout.font_title.render("Game of Life", True, vars.TEXT)
+    title = render_text(layout.font_title, "Game of Life", vars.TEXT)
     surf.blit(title, (panel.x + 16, panel.y + 14))
 
     # Accent underline
@@ -60,7 +69,7 @@ class Button:
         pygame.draw.rect(surf, fill, self.rect, border_radius=12)
         pygame.draw.rect(surf, vars.PANEL_STROKE, self.rect, width=1, border_radius=12)
 
-        text = layout.font_ui.render(self.label, True, vars.BTN_TEXT)
+        text = render_text(layout.font_ui, self.label, vars.BTN_TEXT)
         surf.blit(
             text,
             (self.rect.centerx - text.get_width() // 2,
@@ -96,8 +105,9 @@ class Slider:
         elif e.type == pygame.MOUSEMOTION and self.dragging:
             self.set_from_mouse(e.pos[0])
 
-    def draw(self, surf: pygame.Surface, layout: vars.Layout, label: str) -> None:
-        lab = layout.font_small.render(f"{label}: {self.value:.1f} gen/s", True, vars.TEXT_MUTED)
+    def draw(self, surf: pygame.Surface, layout: vars.Layout, label: str, text: Optional[str] = None) -> None:
+        """text, if given, replaces the value after the label."""
+        lab = render_text(layout.font_small, f"{label}: {text or f'{self.value:.1f} gen/s'}", vars.TEXT_MUTED)
         surf.blit(lab, (self.rect.x, self.rect.y - lab.get_height() - 8))
 
         pygame.draw.rect(surf, vars.SLIDER_TRACK, self.rect, border_radius=10)
@@ -123,6 +133,114 @@ class GridLine:
         pygame.draw.line(surf, vars.GRID_LINE, self.start, self.end, 1)
 
 
+def cell_at(layout: vars.Layout, mx: int, my: int):
+    """(col, row) of the board cell under the mouse, or None."""
+    c = (mx - layout.board_x) // layout.tile
+    r = (my - layout.board_y) // layout.tile
+    if 0 <= c < layout.cols and 0 <= r < layout.rows:
+        return c, r
+    return None
+
+
+class Viewport:
+    """
+    Pan/zoom window onto a board that has no edges or does not fit the board
+    area: world cell (x0, y0) sits at the board's top-left corner.
+
+    A zoom level is (tile, block): every tile x tile pixel square shows a
+    block x block square of cells. Zoomed in, block is 1. Zoomed out, tile is 1
+    and each pixel summarizes block^2 cells; x0/y0 are then kept on multiples
+    of block so the reductions line up from frame to frame.
+    """
+
+    ZOOM_LEVELS = (
+        (1, 64), (1, 32), (1, 16), (1, 8), (1, 4), (1, 2),
+        (1, 1), (2, 1), (3, 1), (4, 1), (6, 1), (8, 1), (10, 1), (14, 1), (20, 1), (28, 1), (40, 1),
+    )
+
+    def __init__(self, layout: vars.Layout):
+        self.layout = layout
+        self.x0 = 0
+        self.y0 = 0
+        levels = self.ZOOM_LEVELS
+        self.level = min(range(len(levels)), key=lambda k: abs(levels[k][0] - layout.tile))
+
+    @property
+    def tile(self) -> int:
+        return self.ZOOM_LEVELS[self.level][0]
+
+    @property
+    def block(self) -> int:
+        return self.ZOOM_LEVELS[self.level][1]
+
+    @property
+    def cols(self) -> int:
+        """Cells (blocks, when zoomed out) at least partly inside the board area."""
+        return -(-self.layout.board_w // self.tile)
+
+    @property
+    def rows(self) -> int:
+        return -(-self.layout.board_h // self.tile)
+
+    def key(self) -> tuple[int, int, int]:
+        return self.x0, self.y0, self.level
+
+    def label(self) -> str:
+        if self.block > 1:
+            return f"1 px / {self.block}x{self.block} cells"
+        return f"{self.tile} px/cell"
+
+    def cell_at(self, mx: int, my: int):
+        """World (col, row) under the mouse (top-left cell of its block), or None outside the board area."""
+        lay = self.layout
+        if not (0 <= mx - lay.board_x < lay.board_w and 0 <= my - lay.board_y < lay.board_h):
+            return None
+        return (self.x0 + (mx - lay.board_x) // self.tile * self.block,
+                self.y0 + (my - lay.board_y) // self.tile * self.block)
+
+    def pan(self, dcols: int, drows: int) -> None:
+        """Move by whole on-screen cells (blocks, when zoomed out)."""
+        self.x0 += dcols * self.block
+        self.y0 += drows * self.block
+
+    def zoom_at(self, mx: int, my: int, steps: int) -> None:
+        """Move steps zoom levels in (+) or out (-), keeping the cell under (mx, my) in place."""
+        level = max(0, min(len(self.ZOOM_LEVELS) - 1, self.level + steps))
+        if level == self.level:
+            return
+
+        px = min(max(mx - self.layout.board_x, 0), self.layout.board_w)
+        py = min(max(my - self.layout.board_y, 0), self.layout.board_h)
+        wx = self.x0 + px * self.block / self.tile
+        wy = self.y0 + py * self.block / self.tile
+        self.level = level
+        b = self.block
+        self.x0 = round((wx - px * b / self.tile) / b) * b
+        self.y0 = round((wy - py * b / self.tile) / b) * b
+
+
+def cells_on_line(a: tuple[int, int], b: tuple[int, int]):
+    """Cells from a to b inclusive (Bresenham), so fast drags don't leave gaps."""
+    c0, r0 = a
+    c1, r1 = b
+    dc = abs(c1 - c0)
+    dr = -abs(r1 - r0)
+    sc = 1 if c0 < c1 else -1
+    sr = 1 if r0 < r1 else -1
+    err = dc + dr
+    while True:
+        yield c0, r0
+        if c0 == c1 and r0 == r1:
+            return
+        e2 = 2 * err
+        if e2 >= dr:
+            err += dr
+            c0 += sc
+        if e2 <= dc:
+            err += dc
+            r0 += sr
+
+
 def create_grid(layout: vars.Layout, gridlines: list[GridLine]) -> None:
     gridlines.clear()
 
@@ -0,0 +1,495 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+import rules
+from engine import Engine
+
+# load_points() builds squares of 2^POINTS_LEAF cells from a small dense array
+POINTS_LEAF = 6
+
+
+class Node:
+    """
+    Quadtree node. Level 0 nodes are single cells; a level k node is a
+    2^k x 2^k square made of four level k-1 children.
+    Nodes are canonical (see HashLife.join), so identity equals content.
+    """
+
+    __slots__ = ("nw", "ne", "sw", "se", "level", "pop")
+
+    def __init__(self, nw, ne, sw, se, level: int, pop: int):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.pop = pop
+
+
+# successor() polls HashLife.interrupt once per this many cache misses
+INTERRUPT_EVERY = 4096
+
+
+class _Overflow(Exception):
+    """The node table reached max_nodes in the middle of a jump."""
+
+
+class Interrupted(Exception):
+    """advance() was stopped by HashLife.interrupt; the root is where the last whole jump left it."""
+
+
+class HashLife:
+    """
+    Memoized quadtree universe (Gosper's HashLife) on the unbounded plane.
+
+    max_nodes caps the canonical node table. Between jumps, everything not
+    reachable from the current root is dropped together with the result
+    memo once the table is over the cap. A jump that fills the table is
+    abandoned, the table collected and the jump redone as two jumps of half
+    the length, down to single generations; the cap is only exceeded when the
+    pattern itself needs more nodes than that.
+
+    interrupt, if set, is called every INTERRUPT_EVERY cache misses during a
+    jump; once it returns True, advance() raises Interrupted.
+    """
+
+    def __init__(self, max_nodes: int = 1_000_000, rule: rules.Rule = rules.CONWAY):
+        self.max_nodes = max_nodes
+        self.rule = rule
+        self._table = rule.table.tolist()
+
+        self.off = Node(None, None, None, None, 0, 0)
+        self.on = Node(None, None, None, None, 0, 1)
+
+        self.nodes: dict[tuple, Node] = {}
+        self.results: dict[tuple, Node] = {}
+        self._empty: list[Node] = [self.off]
+
+        self.hits = 0
+        self.misses = 0
+        self.gc_runs = 0
+        self._capped = False  # join() raises _Overflow at max_nodes (while jumping)
+        self.interrupt: Optional[Callable[[], bool]] = None
+
+        # Root covers [x0, x0 + 2^level) x [y0, y0 + 2^level) in world cells.
+        self.root = self.empty(3)
+        self.x0 = 0
+        self.y0 = 0
+
+    # --- node construction ---
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key = (nw, ne, sw, se)
+        node = self.nodes.get(key)
+        if node is None:
+            if self._capped and len(self.nodes) >= self.max_nodes:
+                raise _Overflow
+            node = Node(nw, ne, sw, se, nw.level + 1, nw.pop + ne.pop + sw.pop + se.pop)
+            self.nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def expand(self, node: Node) -> Node:
+        """Same pattern, one level up, centered."""
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw),
+            self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e),
+            self.join(node.se, e, e, e),
+        )
+
+    def centre(self, m: Node) -> Node:
+        return self.join(m.nw.se, m.ne.sw, m.sw.ne, m.se.nw)
+
+    def _centre_h(self, w: Node, e: Node) -> Node:
+        return self.join(w.ne, e.nw, w.se, e.sw)
+
+    def _centre_v(self, n: Node, s: Node) -> Node:
+        return self.join(n.sw, n.se, s.nw, s.ne)
+
+    # --- evolution ---
+    def _life4x4(self, m: Node) -> Node:
+        """Advance the centre 2x2 of a level 2 node by one generation."""
+        cells = [
+            [m.nw.nw.pop, m.nw.ne.pop, m.ne.nw.pop, m.ne.ne.pop],
+            [m.nw.sw.pop, m.nw.se.pop, m.ne.sw.pop, m.ne.se.pop],
+            [m.sw.nw.pop, m.sw.ne.pop, m.se.nw.pop, m.se.ne.pop],
+            [m.sw.sw.pop, m.sw.se.pop, m.se.sw.pop, m.se.se.pop],
+        ]
+        table = self._table
+        out = []
+        for r in (1, 2):
+            for c in (1, 2):
+                # Packed 3x3 neighborhood, top-left cell in the high bit
+                idx = 0
+                for dr in (-1, 0, 1):
+                    for dc in (-1, 0, 1):
+                        idx = (idx << 1) | cells[r + dr][c + dc]
+                out.append(self.on if table[idx] else self.off)
+        return self.join(*out)
+
+    def set_rule(self, rule: rules.Rule) -> None:
+        """Memoized results were computed under the old rule; they are dropped."""
+        if rule != self.rule:
+            self.rule = rule
+            self._table = rule.table.tolist()
+            self.results = {}
+
+    def successor(self, m: Node, j: int) -> Node:
+        """
+        Centre half of m (level m.level - 1) advanced by 2^j generations.
+        Requires 0 <= j <= m.level - 2.
+        """
+        if m.pop == 0:
+            return m.nw
+
+        key = (m, j)
+        r = self.results.get(key)
+        if r is not None:
+            self.hits += 1
+            return r
+        self.misses += 1
+        if not self.misses % INTERRUPT_EVERY and self.interrupt is not None and self.interrupt():
+            raise Interrupted
+
+        if m.level == 2:
+            r = self._life4x4(m)
+        else:
+            n00, n01, n02 = m.nw, self._centre_h(m.nw, m.ne), m.ne
+            n10, n11, n12 = self._centre_v(m.nw, m.sw), self.centre(m), self._centre_v(m.ne, m.se)
+            n20, n21, n22 = m.sw, self._centre_h(m.sw, m.se), m.se
+
+            if j == m.level - 2:
+                # Two half-steps: 2^(j-1) on the nine overlapping squares, then again.
+                s = self.successor
+                c00, c01, c02 = s(n00, j - 1), s(n01, j - 1), s(n02, j - 1)
+                c10, c11, c12 = s(n10, j - 1), s(n11, j - 1), s(n12, j - 1)
+                c20, c21, c22 = s(n20, j - 1), s(n21, j - 1), s(n22, j - 1)
+                step = j - 1
+            else:
+                # Fewer generations than this level allows: no time passes here.
+                c = self.centre
+                c00, c01, c02 = c(n00), c(n01), c(n02)
+                c10, c11, c12 = c(n10), c(n11), c(n12)
+                c20, c21, c22 = c(n20), c(n21), c(n22)
+                step = j
+
+            r = self.join(
+                self.successor(self.join(c00, c01, c10, c11), step),
+                self.successor(self.join(c01, c02, c11, c12), step),
+                self.successor(self.join(c10, c11, c20, c21), step),
+                self.successor(self.join(c11, c12, c21, c22), step),
+            )
+
+        self.results[key] = r
+        return r
+
+    def _grow(self) -> None:
+        half = 1 << (self.root.level - 1)
+        self.root = self.expand(self.root)
+        self.x0 -= half
+        self.y0 -= half
+
+    def advance(self, n: int) -> None:
+        """Advance the universe by n generations, one power of two per set bit."""
+        j = 0
+        while n:
+            if n & 1:
+                self._jump(j)
+            n >>= 1
+            j += 1
+
+    def _jump(self, j: int) -> None:
+        """Advance by 2^j generations, in halves if one jump would overflow the node table."""
+        # Pattern must sit in the centre quarter so light-speed growth
+        # over 2^j generations stays inside the returned centre half.
+        while (self.root.level < j + 3
+               or self.centre(self.centre(self.root)).pop != self.root.pop):
+            self._grow()
+        self.maybe_collect()
+
+        # With the table still full after collecting, the pattern alone
+        # needs more than max_nodes; it is stepped anyway.
+        self._capped = j > 0 and len(self.nodes) < self.max_nodes
+        try:
+            root = self.successor(self.root, j)
+        except _Overflow:
+            root = None
+        finally:
+            self._capped = False
+        if root is None:
+            # What the abandoned jump built is unreachable from the root.
+            self.collect()
+            self._jump(j - 1)
+            self._jump(j - 1)
+            return
+
+        quarter = 1 << (self.root.level - 2)
+        self.root = root
+        self.x0 += quarter
+        self.y0 += quarter
+        self.maybe_collect()
+
+    # --- memory ---
+    def maybe_collect(self) -> None:
+        if len(self.nodes) > self.max_nodes:
+            self.collect()
+
+    def collect(self) -> None:
+        """Keep only nodes reachable from the root (and the empty spine)."""
+        keep: dict[tuple, Node] = {}
+        stack = [self.root] + self._empty[1:]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in keep:
+                continue
+            keep[key] = node
+            stack.extend(key)
+
+        self.nodes = keep
+        self.results = {}
+        self.gc_runs += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "nodes": len(self.nodes),
+            "results": len(self.results),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "gc_runs": self.gc_runs,
+            "population": self.root.pop,
+        }
+
+    # --- array conversion ---
+    def _build(self, cells: np.ndarray, level: int, x: int, y: int) -> Node:
+        size = 1 << level
+        h, w = cells.shape
+        if x >= w or y >= h or not cells[y:y + size, x:x + size].any():
+            return self.empty(level)
+        if level == 0:
+            return self.on
+        half = size >> 1
+        return self.join(
+            self._build(cells, level - 1, x, y),
+            self._build(cells, level - 1, x + half, y),
+            self._build(cells, level - 1, x, y + half),
+            self._build(cells, level - 1, x + half, y + half),
+        )
+
+    def load(self, cells: np.ndarray, x0: int = 0, y0: int = 0) -> None:
+        """Replace the universe with cells placed at world (x0, y0)."""
+        h, w = cells.shape
+        level = 3
+        while (1 << level) < max(h, w):
+            level += 1
+        self.root = self._build(cells, level, 0, 0)
+        self.x0 = x0
+        self.y0 = y0
+
+    def _build_points(self, xs: np.ndarray, ys: np.ndarray, level: int, x: int, y: int) -> Node:
+        """Node of level at (x, y) holding the live cells (xs, ys) that fall inside it."""
+        if xs.size == 0:
+            return self.empty(level)
+        size = 1 << level
+        if level <= POINTS_LEAF:
+            cells = np.zeros((size, size), dtype=np.uint8)
+            cells[ys - y, xs - x] = 1
+            return self._build(cells, level, 0, 0)
+        half = size >> 1
+        east = xs >= x + half
+        south = ys >= y + half
+        quads = []
+        for s, e in ((False, False), (False, True), (True, False), (True, True)):
+            sel = (south == s) & (east == e)
+            quads.append(self._build_points(xs[sel], ys[sel], level - 1, x + half * e, y + half * s))
+        return self.join(*quads)
+
+    def load_points(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Replace the universe with live cells at world (xs, ys); cost follows the cells, not their bounding box."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if xs.size == 0:
+            self.load(np.zeros((1, 1), dtype=np.uint8))
+            return
+        x0, y0 = int(xs.min()), int(ys.min())
+        xs, ys = xs - x0, ys - y0
+        level = 3
+        while (1 << level) <= max(int(xs.max()), int(ys.max())):
+            level += 1
+        self.root = self._build_points(xs, ys, level, 0, 0)
+        self.x0 = x0
+        self.y0 = y0
+
+    def render(self, out: np.ndarray, x0: int = 0, y0: int = 0) -> None:
+        """Write the live cells inside the window at world (x0, y0) into out."""
+        h, w = out.shape
+        stack = [(self.root, self.x0 - x0, self.y0 - y0)]
+        while stack:
+            node, x, y = stack.pop()
+            size = 1 << node.level
+            if node.pop == 0 or x >= w or y >= h or x + size <= 0 or y + size <= 0:
+                continue
+            if node.level == 0:
+                out[y, x] = 1
+                continue
+            half = size >> 1
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+
+    def population_in(self, x0: int, y0: int, w: int, h: int) -> int:
+        """Live cells in [x0, x0 + w) x [y0, y0 + h); nodes wholly inside count by their pop."""
+        total = 0
+        stack = [(self.root, self.x0 - x0, self.y0 - y0)]
+        while stack:
+            node, x, y = stack.pop()
+            size = 1 << node.level
+            if node.pop == 0 or x >= w or y >= h or x + size <= 0 or y + size <= 0:
+                continue
+            if x >= 0 and y >= 0 and x + size <= w and y + size <= h:
+                total += node.pop
+                continue
+            half = size >> 1
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+        return total
+
+    # --- single cells ---
+    def get(self, x: int, y: int) -> bool:
+        node = self.root
+        x -= self.x0
+        y -= self.y0
+        if not (0 <= x < 1 << node.level and 0 <= y < 1 << node.level):
+            return False
+        while node.level > 0 and node.pop:
+            half = 1 << (node.level - 1)
+            if y < half:
+                node = node.nw if x < half else node.ne
+            else:
+                node = node.sw if x < half else node.se
+                y -= half
+            if x >= half:
+                x -= half
+        return node.pop == 1
+
+    def set(self, x: int, y: int, alive: bool) -> None:
+        """Set one cell, rebuilding only the nodes on its path (the root grows to cover it)."""
+        while not (0 <= x - self.x0 < 1 << self.root.level and 0 <= y - self.y0 < 1 << self.root.level):
+            self._grow()
+        self.root = self._set(self.root, x - self.x0, y - self.y0, alive)
+
+    def _set(self, node: Node, x: int, y: int, alive: bool) -> Node:
+        if node.level == 0:
+            return self.on if alive else self.off
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+        if y < half:
+            if x < half:
+                nw = self._set(nw, x, y, alive)
+            else:
+                ne = self._set(ne, x - half, y, alive)
+        elif x < half:
+            sw = self._set(sw, x, y - half, alive)
+        else:
+            se = self._set(se, x - half, y - half, alive)
+        return self.join(nw, ne, sw, se)
+
+    def live_points(self) -> tuple[np.ndarray, np.ndarray]:
+        """World (xs, ys) of every live cell; cost grows with population, not area."""
+        xs: list[int] = []
+        ys: list[int] = []
+        stack = [(self.root, self.x0, self.y0)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.pop == 0:
+                continue
+            if node.level == 0:
+                xs.append(x)
+                ys.append(y)
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x + half, y))
+            stack.append((node.sw, x, y + half))
+            stack.append((node.se, x + half, y + half))
+        return np.array(xs, dtype=np.int64), np.array(ys, dtype=np.int64)
+
+
+class HashLifeEngine(Engine):
+    """
+    Engine wrapper around HashLife for "jump ahead" use.
+
+    HashLife runs on the unbounded plane, so the engine never wraps:
+    patterns that leave the board keep evolving off-screen, and to_array()
+    only shows what is inside the board. Jumps skip the intermediate
+    generations, so births and deaths are not counted.
+    """
+
+    name = "hashlife"
+    wraps = False
+    # Empty space is never stepped (an empty node's future is empty)
+    birth_on_zero = False
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True, max_nodes: int = 1_000_000):
+        super().__init__(cols, rows, wrap=False)
+        self.life = HashLife(max_nodes=max_nodes)
+
+    def set_wrap(self, wrap: bool) -> None:
+        # The plane has no seam to wrap around.
+        pass
+
+    def set_rule(self, rule: rules.Rule) -> None:
+        super().set_rule(rule)
+        self.life.set_rule(rule)
+
+    def to_array(self) -> np.ndarray:
+        out = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.life.render(out)
+        return out
+
+    def _load(self, cells: np.ndarray) -> None:
+        self.life.load(np.asarray(cells).reshape(self.rows, self.cols))
+
+    def get(self, col: int, row: int) -> bool:
+        return self.life.get(col, row)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        self.life.set(col, row, alive)
+
+    def region(self, x0: int, y0: int, w: int, h: int) -> np.ndarray:
+        # Rendered straight from the tree; cells off the board are dead
+        out = np.zeros((h, w), dtype=np.uint8)
+        ax, ay = max(x0, 0), max(y0, 0)
+        bx, by = min(x0 + w, self.cols), min(y0 + h, self.rows)
+        if ax < bx and ay < by:
+            self.life.render(out[ay - y0:by - y0, ax - x0:bx - x0], ax, ay)
+        return out
+
+    def count_population(self) -> int:
+        # From the memoized node populations, not a render of the board
+        return self.life.population_in(0, 0, self.cols, self.rows)
+
+    def step(self, n: int = 1) -> None:
+        self.life.advance(n)
+        self.revision += 1
+        self.stats.generation += n
+        self.stats.population = self.count_population()
+        self.stats.births = 0
+        self.stats.deaths = 0
+
+    def cache_stats(self) -> dict:
+        return self.life.stats()
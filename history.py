@@ -0,0 +1,183 @@
+"""
+Rewind buffer of past generations.
+
+After any discontinuity, and then every keyframe_every generations, the
+board is stored whole (bit-packed); the generations in between are stored as
+the cells that flipped since the generation before, so recording one costs
+as much as the flips, not the board. Everything is zlib-compressed, so a
+settled board costs a few bytes per generation. Restoring a generation is one
+keyframe decompress plus the flips recorded after it, up to that generation;
+a keyframe is also started early once the flips since the last one outweigh
+it, which bounds that replay. A generation that flips more cells than the
+packed board has bytes (a soup) is stored as an uncompressed keyframe.
+"""
+
+import zlib
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_KEYFRAME_EVERY = 32
+
+
+def _dense(at: np.ndarray, packed: np.ndarray) -> bool:
+    """Whether flips at (as uint32 indices) would take more room than the packed board."""
+    return 4 * at.size >= packed.size
+
+
+def _flip(packed: np.ndarray, at: np.ndarray) -> None:
+    """XOR the bits of distinct cell indices at (sorted, unless dense) into a packbits() board."""
+    if at.size == 0:
+        return
+    if _dense(at, packed):
+        # A soup: one pass over the board beats grouping the bits by byte
+        mask = np.zeros(8 * packed.size, dtype=bool)
+        mask[at] = True
+        packed ^= np.packbits(mask)
+        return
+    byte = at >> 3
+    bits = np.uint8(0x80) >> (at & 7).astype(np.uint8)
+    # Bits landing in the same byte are distinct, so OR-ing them combines them.
+    first = np.flatnonzero(np.diff(byte, prepend=-1))
+    packed[byte[first]] ^= np.bitwise_or.reduceat(bits, first)
+
+
+class History:
+    """
+    Bounded, generation-indexed history of (rows, cols) boards. When the
+    stored bytes exceed max_bytes, the oldest keyframe is evicted together
+    with its deltas (the newest one is always kept).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        self.max_bytes = max_bytes
+        self.keyframe_every = keyframe_every
+        self.clear()
+
+    def clear(self) -> None:
+        self.shape: Optional[tuple[int, int]] = None
+        self.order: deque = deque()  # generations, ascending
+        self.frames: dict[int, tuple[int, bytes]] = {}  # generation -> (keyframe generation, flips or b"")
+        self.keyframes: dict[int, bytes] = {}  # generation -> compressed packed board
+        self.nbytes = 0
+
+        # Packed board at the newest generation (None until it is rebuilt
+        # after a truncate) and how many flip bytes follow the newest keyframe
+        self._packed: Optional[np.ndarray] = None
+        self._key_gen: Optional[int] = None
+        self._flip_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, generation: int) -> bool:
+        return generation in self.frames
+
+    @property
+    def oldest(self) -> Optional[int]:
+        return self.order[0] if self.order else None
+
+    @property
+    def newest(self) -> Optional[int]:
+        return self.order[-1] if self.order else None
+
+    # --- writing ---
+    def record(self, generation: int, cells: np.ndarray) -> None:
+        """Store the whole board at generation; anything at or after generation is dropped first."""
+        if cells.shape != self.shape:
+            self.clear()
+            self.shape = cells.shape
+        if self.order and generation <= self.order[-1]:
+            self.truncate(generation)
+        self._keyframe(generation, np.packbits(cells != 0))
+
+    def advance(self, generation: int, xs: np.ndarray, ys: np.ndarray) -> None:
+        """
+        Store generation as the generation before it (which must be retained)
+        with cells (xs, ys) flipped; anything at or after generation is dropped first.
+        """
+        if self.order and generation <= self.order[-1]:
+            self.truncate(generation)
+        if not self.order or self.order[-1] != generation - 1:
+            raise ValueError(f"generation {generation - 1} is not recorded")
+        if self._packed is None:
+            self._packed = self._packed_at(generation - 1)
+
+        at = np.asarray(ys, dtype=np.int64) * self.shape[1] + np.asarray(xs, dtype=np.int64)
+        dense = _dense(at, self._packed)
+        if not dense:
+            # Engines mostly report flips in row order already, which a stable sort keeps cheap.
+            at = np.sort(at, kind="stable")
+        _flip(self._packed, at)
+
+        # Flips are stored as gaps between sorted cell indices, which compress
+        # well. When there are more of them than board bytes the board is
+        # stored instead, uncompressed: it is mostly noise then, and zlib
+        # would cost more than the step.
+        if dense:
+            self._keyframe(generation, self._packed, level=0)
+            return
+        if (generation - self._key_gen >= self.keyframe_every
+                or self._flip_bytes >= len(self.keyframes[self._key_gen])):
+            self._keyframe(generation, self._packed)
+            return
+        blob = zlib.compress(np.diff(at, prepend=0).astype(np.uint32).tobytes(), 1)
+        self.frames[generation] = (self._key_gen, blob)
+        self._flip_bytes += len(blob)
+        self._append(generation, blob)
+
+    def _keyframe(self, generation: int, packed: np.ndarray, level: int = 1) -> None:
+        blob = zlib.compress(packed.tobytes(), level)
+        self.keyframes[generation] = blob
+        self.frames[generation] = (generation, b"")
+        self._packed = packed
+        self._key_gen = generation
+        self._flip_bytes = 0
+        self._append(generation, blob)
+
+    def _append(self, generation: int, blob: bytes) -> None:
+        self.order.append(generation)
+        self.nbytes += len(blob)
+        self._evict()
+
+    def truncate(self, generation: int) -> None:
+        """Drop generation and everything after it."""
+        while self.order and self.order[-1] >= generation:
+            self._drop(self.order.pop())
+        # The buffer may now end inside an older group; the next advance()
+        # rebuilds the board from it and carries on there.
+        self._packed = None
+        self._key_gen = self.frames[self.order[-1]][0] if self.order else None
+        self._flip_bytes = sum(len(self.frames[g][1]) for g in self.order
+                               if self.frames[g][0] == self._key_gen)
+
+    def _drop(self, generation: int) -> None:
+        key_gen, delta = self.frames.pop(generation)
+        if key_gen == generation:
+            self.nbytes -= len(self.keyframes.pop(generation))
+        else:
+            self.nbytes -= len(delta)
+
+    def _evict(self) -> None:
+        while self.nbytes > self.max_bytes and len(self.keyframes) > 1:
+            first_key = self.frames[self.order[0]][0]
+            while self.order and self.frames[self.order[0]][0] == first_key:
+                self._drop(self.order.popleft())
+
+    # --- reading ---
+    def _packed_at(self, generation: int) -> np.ndarray:
+        key_gen = self.frames[generation][0]
+        packed = np.frombuffer(zlib.decompress(self.keyframes[key_gen]), dtype=np.uint8).copy()
+        for g in range(key_gen + 1, generation + 1):
+            _flip(packed, np.cumsum(np.frombuffer(zlib.decompress(self.frames[g][1]), dtype=np.uint32),
+                                    dtype=np.int64))
+        return packed
+
+    def get(self, generation: int) -> Optional[np.ndarray]:
+        """The board at generation, or None if it is not retained."""
+        if generation not in self.frames:
+            return None
+        rows, cols = self.shape
+        return np.unpackbits(self._packed_at(generation), count=rows * cols).reshape(rows, cols)
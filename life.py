@@ -0,0 +1,216 @@
+"""
+Headless command-line runner. Never imports pygame, so it works on machines
+without a display.
+
+    python -m life run --size 1000x1000 --generations 5000 --engine bitboard
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import cycles
+import engine
+import patterns
+import rules
+import search
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    try:
+        cols, rows = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected COLSxROWS, got {text!r}")
+    if cols < 1 or rows < 1:
+        raise argparse.ArgumentTypeError(f"board must be at least 1x1, got {text!r}")
+    return cols, rows
+
+
+def parse_rule(text: str) -> rules.Rule:
+    try:
+        return rules.parse_rule(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def run_detecting_cycles(sim: engine.Engine, generations: int,
+                         history: int = cycles.DEFAULT_HISTORY) -> cycles.CycleDetector:
+    """
+    Step one generation at a time while hashing the board; once it repeats,
+    skip ahead arithmetically to the requested generation.
+    """
+    cycle = cycles.CycleDetector(history)
+    xs, ys, states = sim.live_cells()
+    cycle.reset(xs, ys, sim.stats.generation, states)
+    target = sim.stats.generation + generations
+    while sim.stats.generation < target:
+        xs, ys, old, new = sim.step_changes()
+        if cycle.advance(xs, ys, sim.stats.generation, old, new):
+            cycle.fast_forward(sim, target)
+            break
+    return cycle
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    cols, rows = args.size
+    wrap = not args.no_wrap
+
+    sim = engine.make_engine(args.engine, cols, rows, wrap=wrap)
+    # Unbounded engines ignore the flag and never wrap
+    wrap = sim.wrap
+    try:
+        try:
+            sim.set_rule(args.rule)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+        if args.pattern:
+            sim.load_array(patterns.load(args.pattern, cols, rows))
+        else:
+            sim.randomize(args.density, seed=args.seed)
+        start_cells = sim.to_array().copy()
+        start_pop = sim.population()
+
+        t0 = time.perf_counter()
+        if args.detect_cycles:
+            cycle = run_detecting_cycles(sim, args.generations, args.history)
+        else:
+            sim.step(args.generations)
+        elapsed = time.perf_counter() - t0
+
+        final = sim.to_array().copy()
+        result = {
+            "engine": sim.name,
+            "cols": cols,
+            "rows": rows,
+            "wrap": wrap,
+            "rule": str(sim.rule),
+            "seed": args.seed,
+            "density": args.density,
+            "pattern": args.pattern,
+            "generations": args.generations,
+            "start_population": start_pop,
+            "final_population": sim.population(),
+            "total_births": sim.stats.total_births,
+            "total_deaths": sim.stats.total_deaths,
+            "seconds": elapsed,
+            "gens_per_sec": args.generations / elapsed if elapsed else 0.0,
+            "cell_updates_per_sec": args.generations * cols * rows / elapsed if elapsed else 0.0,
+        }
+        if args.detect_cycles:
+            result["period"] = cycle.period
+            result["cycle_start"] = cycle.since
+
+        if args.out:
+            patterns.save(args.out, final == 1, rule=str(sim.rule), generation=sim.stats.generation, wrap=wrap)
+    finally:
+        sim.close()
+
+    if args.compare and args.engine != "numpy":
+        ref = engine.make_engine("numpy", cols, rows, wrap=wrap)
+        ref.set_rule(args.rule)
+        ref.load_array(start_cells)
+        t0 = time.perf_counter()
+        ref.step(args.generations)
+        ref_s = time.perf_counter() - t0
+        result["reference_seconds"] = ref_s
+        result["speedup"] = ref_s / elapsed if elapsed else 0.0
+        result["identical"] = bool((ref.to_array() == final).all())
+
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    print(f"{sim.name}: {cols}x{rows} {'wrap' if wrap else 'bounded'}, {sim.rule.label}, "
+          f"{args.generations} generations in {elapsed:.3f} s "
+          f"({result['gens_per_sec']:.1f} gen/s)")
+    print(f"population: {start_pop} -> {result['final_population']} "
+          f"(births {result['total_births']}, deaths {result['total_deaths']})")
+    if args.detect_cycles:
+        print(f"cycle: {cycle.describe()}")
+    if "speedup" in result:
+        print(f"vs numpy: {result['reference_seconds']:.3f} s, speedup {result['speedup']:.2f}x "
+              f"(identical: {result['identical']})")
+    return 0
+
+
+def cmd_search(args: argparse.Namespace) -> int:
+    cols, rows = args.size
+    spec = search.SoupSpec(cols, rows, args.density, not args.no_wrap, args.rule,
+                           args.max_generations, args.engine, args.history)
+    if not engine.engine_class(args.engine).supports(args.rule):
+        print(f"error: the {args.engine} engine cannot run {args.rule}", file=sys.stderr)
+        return 2
+    seeds = range(args.start, args.start + args.seeds)
+    skipped = len(search.completed_seeds(args.out) & set(seeds))
+    if skipped:
+        print(f"resuming: {skipped} of {args.seeds} soups already in {args.out}")
+
+    best = [None]
+
+    def report(record: dict) -> None:
+        if record["lifespan"] is not None and (best[0] is None or record["lifespan"] > best[0]["lifespan"]):
+            best[0] = record
+            print(f"seed {record['seed']}: settled at gen {record['lifespan']} "
+                  f"(period {record['period']}, population {record['final_population']})")
+
+    t0 = time.perf_counter()
+    n = search.search(spec, seeds, args.out, args.workers, report)
+    elapsed = time.perf_counter() - t0
+    print(f"{n} soups in {elapsed:.1f} s ({n / elapsed if elapsed else 0.0:.1f} soups/s), results in {args.out}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m life", description="Headless Game of Life tools.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run a board for N generations")
+    run.add_argument("--size", type=parse_size, default=(200, 200), help="COLSxROWS (default 200x200)")
+    run.add_argument("--generations", "-g", type=int, default=1000)
+    run.add_argument("--engine", choices=list(engine.ENGINES), default="numpy")
+    run.add_argument("--rule", type=parse_rule, default=rules.CONWAY,
+                     help="B3/S23-style rulestring, Generations rules too (B2/S/C3), "
+                          f"or one of: {', '.join(rules.PRESETS)} (default life)")
+    run.add_argument("--no-wrap", action="store_true", help="bounded grid instead of a torus")
+    run.add_argument("--seed", type=int, default=None, help="seed for the random soup")
+    run.add_argument("--density", type=float, default=0.22, help="random soup density (default 0.22)")
+    run.add_argument("--pattern", help="start from a pattern (.rle, .cells, .json or .golsnap) "
+                                       "instead of a random soup")
+    run.add_argument("--out", help="write the final state here (.rle, .cells, .json or .golsnap)")
+    run.add_argument("--stats", help="write timing and population here (JSON)")
+    run.add_argument("--compare", action="store_true", help="also time the numpy engine and report speedup")
+    run.add_argument("--detect-cycles", action="store_true",
+                     help="hash every generation and fast-forward once the board repeats")
+    run.add_argument("--history", type=int, default=cycles.DEFAULT_HISTORY,
+                     help=f"generations of hashes kept for --detect-cycles (default {cycles.DEFAULT_HISTORY})")
+    run.set_defaults(func=cmd_run)
+
+    find = sub.add_parser("search", help="run many seeded soups to stabilization across all cores")
+    find.add_argument("--out", required=True, help="JSONL results file; seeds already in it are skipped")
+    find.add_argument("--seeds", type=int, default=1000, help="number of soups (default 1000)")
+    find.add_argument("--start", type=int, default=0, help="first seed (default 0)")
+    find.add_argument("--size", type=parse_size, default=(64, 64), help="COLSxROWS (default 64x64)")
+    find.add_argument("--density", type=float, default=0.22, help="soup density (default 0.22)")
+    find.add_argument("--rule", type=parse_rule, default=rules.CONWAY)
+    find.add_argument("--no-wrap", action="store_true", help="bounded grid instead of a torus")
+    find.add_argument("--max-generations", type=int, default=20000,
+                      help="give up on a soup that has not settled by then (default 20000)")
+    # Pool workers are daemonic and cannot start the parallel engine's own processes
+    find.add_argument("--engine", choices=[e for e in engine.ENGINES if e != "parallel"], default="numpy")
+    find.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    find.add_argument("--history", type=int, default=cycles.DEFAULT_HISTORY,
+                      help=f"generations of hashes kept per soup (default {cycles.DEFAULT_HISTORY})")
+    find.set_defaults(func=cmd_search)
+
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
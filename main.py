@@ -1,10 +1,49 @@
+import argparse
+import dataclasses
+import os
+import time
+
 import pygame
 import vars
-import creatures
 import gameboard
-
-
-def main() -> None:
+import creatures
+import cycles
+import engine
+import hashlife
+import history
+import life
+import patterns
+import profiler
+import render
+import rules
+import worker
+
+
+# Arrow keys pan an unbounded board by an eighth of the view
+PAN_KEYS = {
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0),
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+}
+
+# Zoom levels stepped by the keyboard (see gameboard.Viewport.ZOOM_LEVELS)
+ZOOM_KEYS = {
+    pygame.K_MINUS: -1,
+    pygame.K_KP_MINUS: -1,
+    pygame.K_EQUALS: 1,
+    pygame.K_PLUS: 1,
+    pygame.K_KP_PLUS: 1,
+}
+
+# Keys that edit the board; ignored while a jump runs on the worker thread
+# (they would wait for it, freezing the window)
+EDIT_KEYS = {pygame.K_c, pygame.K_r, pygame.K_u, pygame.K_n, pygame.K_b,
+             pygame.K_j, pygame.K_s, pygame.K_l, pygame.K_w}
+
+
+def main(engine_name: str = "numpy", renderer_name: str = "array", size=None, pattern=None,
+         rule: rules.Rule = rules.CONWAY, profile_csv=None) -> None:
     pygame.init()
 
     w, h = vars.choose_window_size()
@@ -14,35 +53,52 @@ def main() -> None:
     layout = vars.build_layout(w, h)
 
     clock = pygame.time.Clock()
-    tiles: list[creatures.Tile] = []
     gridlines: list[gameboard.GridLine] = []
 
-    creatures.create_tiles(layout, tiles)
-
     # --- Wrapping toggle state ---
     wrap_enabled = True
-    creatures.link_neighbors(layout, tiles, wrap=wrap_enabled)
+    cols, rows = size or (layout.cols, layout.rows)
+    sim = engine.make_engine(engine_name, cols, rows, wrap=wrap_enabled)
+    jumper = hashlife.HashLifeEngine(cols, rows)
+    sim.set_rule(rule)
+    if jumper.supports(rule):
+        jumper.set_rule(rule)
+
+    # Unbounded engines, and boards that don't fit the board area, are shown
+    # through a pan/zoom window. Unbounded engines (and HashLife) never wrap.
+    unbounded = sim.unbounded
+    use_viewport = unbounded or (cols, rows) != (layout.cols, layout.rows)
+    viewport = gameboard.Viewport(layout) if use_viewport else None
+    if not sim.wraps:
+        wrap_enabled = False
+    board = creatures.Board(layout, sim, viewport)
 
     gameboard.create_grid(layout, gridlines)
 
     # --- State ---
-    sim_running = False
-    tick_accum = 0.0
-    generation = 0
+    # Pause as soon as the board settles into a still life or oscillator (A)
+    auto_pause = False
+    # Step as fast as possible instead of at the slider's speed (T)
+    turbo = False
 
     # Optional starting pattern
-    creatures.clear(tiles)
+    at = board.tile
 
-    def at(c, r):
-        return tiles[r * layout.cols + c]
-
-    if layout.cols > 12 and layout.rows > 12:
+    if board.cols > 12 and board.rows > 12:
         at(6, 6).alive = True
         at(7, 7).alive = True
         at(5, 8).alive = True
         at(6, 8).alive = True
         at(7, 8).alive = True
 
+    cycle = cycles.CycleDetector()
+    cycle.reset(*sim.live_points(), sim.stats.generation)
+
+    # Rewind buffer (bounded boards, two-state rules only). Edits just mark it stale; the board
+    # is recorded before the next step or rewind, not once per painted cell.
+    past = None if unbounded else history.History(vars.HISTORY_MAX_BYTES, vars.HISTORY_KEYFRAME_EVERY)
+    past_stale = True
+
     # --- UI layout ---
     pad = layout.pad
     panel = pygame.Rect(pad, pad, layout.panel_w, layout.screen_h - pad * 2)
@@ -56,120 +112,428 @@ def main() -> None:
     btn_run = gameboard.Button(x, y, bw, bh, "Start (Space)")
     y += bh + gap
 
-    btn_step = gameboard.Button(x, y, bw, bh, "Step (N)")
+    half_w = (bw - gap) // 2
+    third_w = (bw - 2 * gap) // 3
+    btn_back = gameboard.Button(x, y, third_w, bh, "Back (B)")
+    btn_step = gameboard.Button(x + third_w + gap, y, third_w, bh, "Step (N)")
+    btn_jump = gameboard.Button(x + 2 * (third_w + gap), y, bw - 2 * (third_w + gap), bh, "Jump (J)")
     y += bh + gap
 
-    btn_clear = gameboard.Button(x, y, bw, bh, "Clear (C)")
+    btn_clear = gameboard.Button(x, y, half_w, bh, "Clear (C)")
+    btn_rule = gameboard.Button(x + half_w + gap, y, bw - half_w - gap, bh, f"{rule.label} (U)")
     y += bh + gap
 
     btn_rand = gameboard.Button(x, y, bw, bh, "Randomize (R)")
     y += bh + gap
     
-    btn_wrap = gameboard.Button(x, y, bw, 40, "Wrap: On (W)")
+    if viewport is not None:
+        # Wrap shares its row with the zoom buttons
+        quarter_w = (bw - half_w - 2 * gap) // 2
+        btn_wrap = gameboard.Button(x, y, half_w, 40, "Wrap: On (W)")
+        btn_zoom_out = gameboard.Button(x + half_w + gap, y, quarter_w, 40, "-")
+        btn_zoom_in = gameboard.Button(x + half_w + quarter_w + 2 * gap, y,
+                                       bw - half_w - quarter_w - 2 * gap, 40, "+")
+    else:
+        btn_wrap = gameboard.Button(x, y, bw, 40, "Wrap: On (W)")
     y += bh + gap
     y += 40
 
     div_y = y + 20
+    dividers = ((panel.x + 16, div_y, panel.w - 32),)
 
     speed = 10.0
     slider = gameboard.Slider(x, y, bw, 1.0, 60.0, speed)
 
+    buttons = [
+        ("run", btn_run),
+        ("back", btn_back),
+        ("step", btn_step),
+        ("jump", btn_jump),
+        ("clear", btn_clear),
+        ("rule", btn_rule),
+        ("rand", btn_rand),
+        ("wrap", btn_wrap),
+    ]
+    if viewport is not None:
+        buttons += [("zoom_out", btn_zoom_out), ("zoom_in", btn_zoom_in)]
+
     # --- Mouse state (for drag paint/erase) ---
     mouse_down = False
     mouse_released = False
     left_down = False
     right_down = False
+    stroke_cell = None  # last cell painted in the current drag stroke
+    pan_from = None  # last middle-drag position, while panning
+
+    # --- Rendering state (dirty rectangles) ---
+    layers = render.StaticLayers()
+    if viewport is not None:
+        renderer = render.ViewportRenderer(layout, layers, viewport)
+    else:
+        renderer = render.RENDERERS[renderer_name](layout, layers)
+    regions = render.DirtyRegions()
+    need_full = True
+
+    # Frame phase timings: overlay (P) and/or a CSV file (--profile-csv)
+    prof = profiler.FrameProfiler(profile_csv)
+
+    # The simulation steps on a background thread (see worker.py); everything
+    # below that touches sim runs with the worker held between generations.
+    def rehash() -> None:
+        """The board was replaced: hash it from scratch and forget the cycle history."""
+        nonlocal past_stale
+        xs, ys, states = sim.live_cells()
+        cycle.reset(xs, ys, sim.stats.generation, states)
+        past_stale = True
+
+    def rewinding() -> bool:
+        """History stores alive/dead only, so it is off under Generations rules."""
+        return past is not None and sim.rule.states == 2
+
+    def sync_history() -> None:
+        """Record the current board if it was edited since it was last recorded."""
+        nonlocal past_stale
+        if rewinding() and past_stale:
+            past.record(sim.stats.generation, sim.to_array())
+        past_stale = False
+
+    def step_once() -> bool:
+        """One generation; False when auto-pause wants the simulation stopped."""
+        t0 = time.perf_counter() if prof.enabled else None
+        sync_history()
+        xs, ys, old, new = sim.step_changes()
+        if rewinding():
+            past.advance(sim.stats.generation, xs, ys)
+
+        known = cycle.period is not None
+        settled = cycle.advance(xs, ys, sim.stats.generation, old, new) and not known and auto_pause
+        if t0 is not None:
+            prof.add_sim(time.perf_counter() - t0)
+        return not settled
+
+    def capture() -> tuple:
+        """What one frame draws, read together so the panel matches the board."""
+        # The view is read first: if it moves while the cells are read, the
+        # snapshot is stale by key and gets requested again.
+        info = {"view": viewport.key() if viewport is not None else None,
+                "cycle": cycle.describe()}
+        cells = board.visible_cells()
+        if unbounded:
+            info["chunks"] = len(sim.chunks)
+        if past is not None:
+            info["history"] = (len(past), past.nbytes)
+        info["hashlife"] = jumper.cache_stats()
+        return cells, dataclasses.replace(sim.stats), info
+
+    sim_worker = worker.SimWorker(step_once, capture, rate=speed, budget=vars.TURBO_BUDGET)
+    # Closing the window abandons a jump instead of waiting for it
+    jumper.life.interrupt = lambda: sim_worker.stopping
+
+    def step_back() -> None:
+        nonlocal past_stale
+        # The restored board is already in the buffer, so it is not marked
+        # stale; stepping on re-records the later generations over the old ones.
+        if not rewinding():
+            return
+        with sim_worker.editing():
+            sync_history()
+            generation = sim.stats.generation - 1
+            cells = past.get(generation)
+            if cells is None:
+                return
+            sim.load_array(cells)
+            sim.stats.generation = generation
+            rehash()
+            past_stale = False
 
-    def step_once() -> None:
-        nonlocal generation
-        for t in tiles:
-            t.compute_next()
-        for t in tiles:
-            t.apply_next()
-        generation += 1
+    def step_manual() -> None:
+        with sim_worker.editing():
+            step_once()
 
-    def alive_count() -> int:
-        return sum(1 for t in tiles if t.alive)
+    def jump() -> None:
+        """J: runs on the worker thread, so a long jump does not freeze the window."""
+        if not sim_worker.busy:
+            sim_worker.submit(jump_now)
+
+    def jump_now() -> None:
+        # In a known cycle only (J mod period) generations need stepping.
+        # HashLife runs the unbounded plane; a board with edges is stepped by
+        # its own engine, which keeps the wrap setting and drops every cell
+        # that leaves it, exactly as J presses of Step would.
+        nonlocal past_stale
+        sync_history()
+        if cycle.period is not None:
+            cycle.fast_forward(sim, sim.stats.generation + vars.JUMP_GENERATIONS)
+            past_stale = True
+            return
+
+        if not unbounded or not jumper.supports(sim.rule):
+            # HashLife is two-state only: step the engine itself
+            left = vars.JUMP_GENERATIONS
+            while left and not sim_worker.stopping:
+                n = min(left, vars.JUMP_SLICE)
+                sim.step(n)
+                left -= n
+            rehash()
+            return
+
+        # From the live cells, not their bounding box (gliders drift apart)
+        jumper.life.load_points(*sim.live_points())
+        try:
+            jumper.step(vars.JUMP_GENERATIONS)
+        except hashlife.Interrupted:
+            return  # the window is closing
+        sim.load_points(*jumper.life.live_points())
+        sim.stats.generation += vars.JUMP_GENERATIONS
+        rehash()
+
+    def clear_board() -> None:
+        with sim_worker.editing():
+            sim.clear()
+            rehash()
+
+    def randomize_board() -> None:
+        with sim_worker.editing():
+            sim.randomize(p=0.22)
+            rehash()
+
+    def paint(cell, alive: bool) -> bool:
+        nonlocal past_stale
+        if sim.get(*cell) == alive:
+            return False
+        # Painting over a dying cell (Generations rules) replaces its state
+        old = int(sim.region(*cell, 1, 1)[0, 0]) if sim.rule.states > 2 else int(not alive)
+        sim.set(*cell, alive)
+        cycle.toggle(*cell, sim.stats.generation, old, int(alive))
+        past_stale = True
+        return True
+
+    def paint_stroke(px: int, py: int, alive: bool) -> None:
+        """Paint from the previous stroke sample to the cell under (px, py)."""
+        nonlocal stroke_cell
+        # No painting while a jump has the board
+        cell = None if sim_worker.busy else board.cell_at(px, py)
+        if cell is None:
+            stroke_cell = None
+            return
+        start = stroke_cell if stroke_cell is not None else cell
+        with sim_worker.hold():
+            # Only publish if a cell actually changed (this runs every frame
+            # while a button is held)
+            changed = [paint(c, alive) for c in gameboard.cells_on_line(start, cell)]
+            if any(changed):
+                sim_worker.publish()
+        stroke_cell = cell
+
+    def load_board(path: str) -> None:
+        """Replace the board from a pattern file; snapshots also restore generation and wrap."""
+        nonlocal wrap_enabled
+        info = None
+        if path.lower().endswith(".golsnap"):
+            xs, ys, info = patterns.load_snapshot_points(path)
+        else:
+            xs, ys = patterns.read_points(path)
+
+        with sim_worker.editing():
+            if unbounded:
+                sim.load_points(xs, ys)
+            else:
+                sim.load_array(patterns.points_to_array(xs, ys, cols, rows))
+            if info is not None:
+                sim.stats.generation = info["generation"]
+                if sim.wraps:
+                    wrap_enabled = info["wrap"]
+                    board.set_wrap(wrap_enabled)
+            rehash()
+
+    def save_board(path: str) -> None:
+        # Snapshots are alive/dead; dying cells (Generations rules) are not saved
+        with sim_worker.hold():
+            if unbounded:
+                xs, ys, states = sim.live_cells()
+                alive = states == 1
+                xs, ys = xs[alive], ys[alive]
+            else:
+                cells = sim.to_array() == 1
+            generation = sim.stats.generation
+        if unbounded:
+            # Packed from the live cells a block of rows at a time, never as one array
+            patterns.save_snapshot_points(path, xs, ys, generation, wrap_enabled)
+        else:
+            patterns.save_snapshot(path, cells, 0, 0, generation, wrap_enabled)
 
     def apply_wrap_setting() -> None:
-        creatures.link_neighbors(layout, tiles, wrap=wrap_enabled)
+        with sim_worker.editing():
+            board.set_wrap(wrap_enabled)
+            rehash()
+
+    def set_rule(new_rule: rules.Rule) -> None:
+        with sim_worker.editing():
+            sim.set_rule(new_rule)
+            if jumper.supports(new_rule):
+                jumper.set_rule(new_rule)
+            if not rewinding() and past is not None:
+                past.clear()
+            btn_rule.label = f"{new_rule.label} (U)"
+            rehash()
+
+    def next_rule() -> None:
+        """Cycle through the presets this engine can run."""
+        presets = [r for r in rules.PRESETS.values() if sim.supports(r)]
+        k = presets.index(sim.rule) + 1 if sim.rule in presets else 0
+        set_rule(presets[k % len(presets)])
+
+    # The view is only read when a snapshot is captured, so moving it never
+    # waits for a generation; the worker publishes the new view when it can.
+    def pan_view(dcols: int, drows: int) -> None:
+        if viewport is not None:
+            viewport.pan(dcols, drows)
+            sim_worker.request()
+
+    if pattern:
+        load_board(pattern)
+    sim_worker.publish()
+    sim_worker.start()
+
+    def zoom_view(steps: int) -> None:
+        """Zoom about the centre of the board area (buttons and keys)."""
+        if viewport is not None:
+            viewport.zoom_at(layout.board_x + layout.board_w // 2, layout.board_y + layout.board_h // 2, steps)
+            sim_worker.request()
 
     def redraw(mx: int, my: int) -> None:
-        win.fill(vars.BG)
+        nonlocal need_full
+        snap = sim_worker.latest()
+        running = sim_worker.running
+        rects: list[pygame.Rect] = []
+        small_h = layout.font_small.size("Ag")[1]
 
-        # Panel
-        panel_rect = gameboard.draw_panel(win, layout)
+        if need_full:
+            win.blit(layers.get(layout, gridlines, dividers), (0, 0))
+            renderer.invalidate(background=True)
+            regions.reset()
 
         # Status
-        status = "Running" if sim_running else "Paused"
-        st = layout.font_small.render(status, True, vars.TEXT_MUTED)
-        win.blit(st, (panel_rect.x + 18, panel_rect.y + 65))
-
-        gameboard.draw_divider(win, panel_rect.x + 16, div_y, panel_rect.w - 32)
+        status = "Jumping..." if sim_worker.busy else "Running" if running else "Paused"
+        if regions.changed("status", status):
+            st = gameboard.render_text(layout.font_small, status, vars.TEXT_MUTED)
+            area = regions.area("status", st.get_rect(topleft=(panel.x + 18, panel.y + 65)))
+            layers.restore(win, area)
+            win.blit(st, (panel.x + 18, panel.y + 65))
+            rects.append(area)
 
         # Labels
-        btn_run.label = "Pause (Space)" if sim_running else "Start (Space)"
-        btn_wrap.label = f"Wrap: {'On' if wrap_enabled else 'Off'} (W)"
-
-        # Hover/press states
-        btn_run.update(mx, my, mouse_down)
-        btn_step.update(mx, my, mouse_down)
-        btn_clear.update(mx, my, mouse_down)
-        btn_rand.update(mx, my, mouse_down)
-        btn_wrap.update(mx, my, mouse_down)
-
-        # Draw buttons
-        btn_run.draw(win, layout)
-        btn_step.draw(win, layout)
-        btn_clear.draw(win, layout)
-        btn_rand.draw(win, layout)
-
-        btn_wrap.draw(win, layout)
-        slider.draw(win, layout, "Speed")
-
-        # Tiles
-        for t in tiles:
-            t.set_hover(mx, my, layout)
-            t.draw(win, layout)
-
-        # Grid
-        for gl in gridlines:
-            gl.draw(win)
+        btn_run.label = "Pause (Space)" if running else "Start (Space)"
+        if not sim.wraps:
+            btn_wrap.label = "Wrap: n/a"
+        else:
+            btn_wrap.label = f"Wrap: {'On' if wrap_enabled else 'Off'} (W)"
+
+        # Hover/press states; a button is repainted only when its look changes
+        for key, btn in buttons:
+            btn.update(mx, my, mouse_down)
+            if regions.changed(key, (btn.label, btn.hover, btn.down)):
+                area = btn.rect.inflate(4, 4)
+                area.h += 2  # drop shadow
+                layers.restore(win, area)
+                btn.draw(win, layout)
+                rects.append(area)
+
+        # Slider (its knob overlaps the divider below it; restore() brings that back)
+        if regions.changed("slider", (slider.value, turbo)):
+            r = slider.rect
+            area = pygame.Rect(r.x - 10, r.y - small_h - 10, r.w + 20, small_h + 10 + r.h + 8)
+            layers.restore(win, area)
+            slider.draw(win, layout, "Speed", "turbo (T)" if turbo else None)
+            rects.append(area)
+        prof.lap("panel")
+
+        # Tiles (the latest published snapshot; one taken before the view last
+        # moved is skipped, the previous frame stays up until the new one lands)
+        if viewport is not None and snap.info["view"] != viewport.key():
+            sim_worker.request()
+        else:
+            rects += renderer.draw(win, snap.cells, snap.version, board.cell_at(mx, my))
+        prof.lap("tiles")
 
         # Footer help + stats (lifted upward a bit)
-        help1 = layout.font_small.render("LMB drag: paint   RMB drag: erase", True, vars.TEXT_MUTED)
-        help2 = layout.font_small.render("Space: start/pause   N: step   W: wrap", True, vars.TEXT_MUTED)
-
+        stats = snap.stats
         stats_lines = [
-            f"Generation: {generation}",
-            f"Alive: {alive_count()}",
-            f"Grid: {layout.cols} x {layout.rows}",
-            f"Speed: {slider.value:.1f} gen/s",
-            f"Wrap: {'On' if wrap_enabled else 'Off'}",
+            f"Generation: {stats.generation}",
+            f"Alive: {stats.population}   (+{stats.births} / -{stats.deaths})",
+            (f"Unbounded: {snap.info['chunks']} chunks" if unbounded
+             else f"Grid: {cols} x {rows}   Wrap: {('On' if wrap_enabled else 'Off') if sim.wraps else 'n/a'}"),
         ]
-        stats_surfs = [layout.font_small.render(s, True, vars.TEXT_MUTED) for s in stats_lines]
+        if viewport is not None:
+            stats_lines.append(f"View: ({viewport.x0}, {viewport.y0})  {viewport.label()}")
+        stats_lines.append(f"Engine: {sim.name}   Achieved: {sim_worker.achieved:.1f} gen/s")
+        stats_lines.append(f"Rule: {sim.rule}" + (f"   ({sim.rule.name})" if sim.rule.name else ""))
+        stats_lines.append(f"Cycle: {snap.info['cycle']}{'   (auto-pause)' if auto_pause else ''}")
+        if rewinding():
+            gens, nbytes = snap.info["history"]
+            stats_lines.append(f"History: {gens} gens, {nbytes / 1e6:.1f} MB")
+        hl = snap.info["hashlife"]
+        if hl["hits"] or hl["misses"]:
+            stats_lines.append(f"HashLife: {hl['nodes']} nodes, {hl['hit_rate'] * 100:.0f}% hits")
+
+        # The profiling overlay takes the place of the help lines
+        help_lines = ["LMB drag: paint   RMB drag: erase",
+                      ("Wheel / -+: zoom   MMB drag / arrows: pan" if viewport is not None
+                       else "Space: start/pause   N: step   W: wrap")]
+        if prof.show:
+            p = prof.summary()
+            if p is None:
+                help_lines = ["Profiling...", ""]
+            else:
+                help_lines = [
+                    f"FPS {p['fps']:.0f}   Frame {p['frame'][0]:.1f} / {p['frame'][1]:.1f} ms",
+                    f"Render {p['render'][0]:.1f} / {p['render'][1]:.1f} ms   (p50 / p95)",
+                    f"Sim {p['sim'][0]:.2f} / {p['sim'][1]:.2f} ms/gen   "
+                    f"{sim_worker.achieved:.0f} gen/s",
+                ]
 
         # Raise the block: bigger bottom padding
         bottom_pad = 42
-        stats_block_h = sum(s.get_height() for s in stats_surfs) + 6 * (len(stats_surfs) - 1)
-        help_block_h = help1.get_height() + 6 + help2.get_height()
-
-        stats_y0 = panel_rect.y + panel_rect.h - bottom_pad - stats_block_h
+        stats_block_h = small_h * len(stats_lines) + 6 * (len(stats_lines) - 1)
+        help_block_h = small_h * len(help_lines) + 6 * (len(help_lines) - 1)
+        stats_y0 = panel.y + panel.h - bottom_pad - stats_block_h
         help_y0 = stats_y0 - 14 - help_block_h
 
-        win.blit(help1, (panel_rect.x + 18, help_y0))
-        win.blit(help2, (panel_rect.x + 18, help_y0 + help1.get_height() + 6))
-
-        yy = stats_y0
-        for s in stats_surfs:
-            win.blit(s, (panel_rect.x + 18, yy))
-            yy += s.get_height() + 6
-
-        pygame.display.flip()
+        # Clear the whole block when its line counts change; otherwise each
+        # line is its own region, so only lines whose text changed are
+        # rendered and repainted (the rest stay on screen)
+        shape = (len(help_lines), len(stats_lines))
+        if regions.changed("footer", shape):
+            area = regions.area("footer", pygame.Rect(panel.x + 16, help_y0, panel.w - 32,
+                                                      stats_y0 + stats_block_h - help_y0))
+            layers.restore(win, area)
+            rects.append(area)
+
+        if regions.changed("footer_text", tuple(help_lines + stats_lines)):
+            lines = ([(help_y0 + i * (small_h + 6), s) for i, s in enumerate(help_lines)]
+                     + [(stats_y0 + i * (small_h + 6), s) for i, s in enumerate(stats_lines)])
+            for i, (yy, s) in enumerate(lines):
+                if regions.changed(("footer", i), (s, yy, shape)):
+                    # Lines only move when the block's shape changes, and then it was cleared above
+                    area = pygame.Rect(panel.x + 16, yy, panel.w - 32, small_h)
+                    layers.restore(win, area)
+                    win.blit(gameboard.render_text(layout.font_small, s, vars.TEXT_MUTED), (panel.x + 18, yy))
+                    rects.append(area)
+        prof.lap("text")
+
+        if need_full:
+            pygame.display.flip()
+            need_full = False
+        elif rects:
+            pygame.display.update(rects)
+        prof.lap("present")
 
     while True:
-        dt = clock.tick(vars.FPS) / 1000.0
+        clock.tick(vars.FPS)
+        prof.begin()
         mx, my = pygame.mouse.get_pos()
+        if sim_worker.error is not None:
+            raise sim_worker.error
 
         mouse_released = False
 
@@ -177,15 +541,43 @@ def main() -> None:
             slider.handle_event(event)
 
             if event.type == pygame.QUIT:
+                sim_worker.stop()
+                sim.close()
+                prof.close()
                 pygame.quit()
                 return
 
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.VIDEOEXPOSE):
+                need_full = True
+
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_down = True
                 if event.button == 1:
                     left_down = True
                 if event.button == 3:
                     right_down = True
+                if event.button == 2:
+                    pan_from = event.pos
+                stroke_cell = None
+                if (left_down or right_down) and not slider.dragging:
+                    paint_stroke(*event.pos, left_down)
+
+            # Paint every motion sample, not just the last position of the frame
+            if event.type == pygame.MOUSEMOTION:
+                if (left_down or right_down) and not slider.dragging:
+                    paint_stroke(*event.pos, left_down)
+                if pan_from is not None and viewport is not None:
+                    # Whole cells only; the remainder carries over to the next sample
+                    dc = (pan_from[0] - event.pos[0]) // viewport.tile
+                    dr = (pan_from[1] - event.pos[1]) // viewport.tile
+                    if dc or dr:
+                        pan_view(int(dc), int(dr))
+                        pan_from = (pan_from[0] - dc * viewport.tile, pan_from[1] - dr * viewport.tile)
+
+            if event.type == pygame.MOUSEWHEEL and viewport is not None:
+                if board.cell_at(mx, my) is not None:
+                    viewport.zoom_at(mx, my, event.y)
+                    sim_worker.request()
 
             if event.type == pygame.MOUSEBUTTONUP:
                 mouse_down = False
@@ -194,66 +586,117 @@ def main() -> None:
                     left_down = False
                 if event.button == 3:
                     right_down = False
+                if event.button == 2:
+                    pan_from = None
+                stroke_cell = None
 
-            if event.type == pygame.KEYDOWN:
+            if event.type == pygame.KEYDOWN and not (sim_worker.busy and event.key in EDIT_KEYS):
                 if event.key == pygame.K_SPACE:
-                    sim_running = not sim_running
+                    sim_worker.running = not sim_worker.running
                 elif event.key == pygame.K_c:
-                    creatures.clear(tiles)
-                    generation = 0
+                    clear_board()
                 elif event.key == pygame.K_r:
-                    creatures.randomize(tiles, p=0.22)
-                    generation = 0
+                    randomize_board()
+                elif event.key == pygame.K_u:
+                    next_rule()
                 elif event.key == pygame.K_n:
-                    sim_running = False
-                    step_once()
-                elif event.key == pygame.K_w:
+                    sim_worker.running = False
+                    step_manual()
+                elif event.key == pygame.K_b:
+                    sim_worker.running = False
+                    step_back()
+                elif event.key == pygame.K_j:
+                    sim_worker.running = False
+                    jump()
+                elif event.key == pygame.K_s:
+                    save_board(vars.SNAPSHOT_PATH)
+                elif event.key == pygame.K_l and os.path.exists(vars.SNAPSHOT_PATH):
+                    sim_worker.running = False
+                    load_board(vars.SNAPSHOT_PATH)
+                elif event.key == pygame.K_a:
+                    auto_pause = not auto_pause
+                elif event.key == pygame.K_t:
+                    turbo = not turbo
+                elif event.key == pygame.K_p:
+                    prof.toggle()
+                elif event.key == pygame.K_w and sim.wraps:
                     wrap_enabled = not wrap_enabled
                     apply_wrap_setting()
-
-        # UI clicks (release-based)
+                elif event.key in ZOOM_KEYS:
+                    zoom_view(ZOOM_KEYS[event.key])
+                elif event.key in PAN_KEYS and viewport is not None:
+                    dc, dr = PAN_KEYS[event.key]
+                    step = max(1, min(viewport.cols, viewport.rows) // 8)
+                    pan_view(dc * step, dr * step)
+
+        # UI clicks (release-based); the ones that edit the board wait out a jump
+        busy = sim_worker.busy
         if btn_run.clicked(mx, my, mouse_released):
-            sim_running = not sim_running
+            sim_worker.running = not sim_worker.running
 
-        if btn_step.clicked(mx, my, mouse_released):
-            sim_running = False
-            step_once()
+        if btn_back.clicked(mx, my, mouse_released) and not busy:
+            sim_worker.running = False
+            step_back()
+
+        if btn_step.clicked(mx, my, mouse_released) and not busy:
+            sim_worker.running = False
+            step_manual()
+
+        if btn_jump.clicked(mx, my, mouse_released) and not busy:
+            sim_worker.running = False
+            jump()
+
+        if btn_clear.clicked(mx, my, mouse_released) and not busy:
+            clear_board()
 
-        if btn_clear.clicked(mx, my, mouse_released):
-            creatures.clear(tiles)
-            generation = 0
+        if btn_rule.clicked(mx, my, mouse_released) and not busy:
+            next_rule()
 
-        if btn_rand.clicked(mx, my, mouse_released):
-            creatures.randomize(tiles, p=0.22)
-            generation = 0
+        if btn_rand.clicked(mx, my, mouse_released) and not busy:
+            randomize_board()
 
-        if btn_wrap.clicked(mx, my, mouse_released):
+        if btn_wrap.clicked(mx, my, mouse_released) and sim.wraps and not busy:
             wrap_enabled = not wrap_enabled
             apply_wrap_setting()
 
+        if viewport is not None:
+            if btn_zoom_out.clicked(mx, my, mouse_released):
+                zoom_view(-1)
+            if btn_zoom_in.clicked(mx, my, mouse_released):
+                zoom_view(1)
+
         # Drag paint/erase (ignore while dragging slider)
         if not slider.dragging:
             if left_down or right_down:
-                for t in tiles:
-                    if t.hover:
-                        if left_down:
-                            t.alive = True
-                        elif right_down:
-                            t.alive = False
-
-        # Simulation update
-        speed = float(slider.value)
-        if sim_running:
-            tick_accum += dt
-            step_interval = 1.0 / max(0.1, speed)
-            while tick_accum >= step_interval:
-                step_once()
-                tick_accum -= step_interval
-        else:
-            tick_accum = 0.0
+                paint_stroke(mx, my, left_down)
+
+        # The worker paces itself; it only needs the current target rate.
+        # Dragging the slider leaves turbo mode.
+        if slider.dragging:
+            turbo = False
+        sim_worker.rate = None if turbo else float(slider.value)
+        prof.lap("events")
 
         redraw(mx, my)
+        prof.end()
 
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description=vars.CAPTION)
+    ap.add_argument("--engine", choices=list(engine.ENGINES), default="numpy",
+                    help="simulation engine (default: numpy)")
+    ap.add_argument("--renderer", choices=list(render.RENDERERS), default="array",
+                    help="board renderer: array (surfarray, constant frame time) or "
+                         "cells (per-cell dirty rects, draws the alive-cell sheen)")
+    ap.add_argument("--size", type=life.parse_size, default=None,
+                    help="board size COLSxROWS (default: fit the window); larger boards "
+                         "are shown through a pan/zoom view")
+    ap.add_argument("--pattern", help="start from a pattern file (.rle, .cells, .json or .golsnap)")
+    ap.add_argument("--rule", type=life.parse_rule, default=rules.CONWAY,
+                    help="B3/S23-style rulestring, Generations rules too (B2/S/C3), "
+                         f"or one of: {', '.join(rules.PRESETS)} (default life); U cycles the presets")
+    ap.add_argument("--profile-csv", help="write per-frame phase timings here (CSV); P shows them in the panel")
+    args = ap.parse_args()
+    if not engine.engine_class(args.engine).supports(args.rule):
+        ap.error(f"the {args.engine} engine cannot run {args.rule}")
+    main(args.engine, args.renderer, args.size, args.pattern, args.rule, args.profile_csv)
@@ -0,0 +1,210 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+import rules
+from engine import ArrayEngine, Engine, array_changes, step_padded
+from rules import Rule
+
+
+def _strip_next(src: np.ndarray, r0: int, r1: int, wrap: bool, rule: Rule = rules.CONWAY) -> np.ndarray:
+    """Next generation of rows [r0, r1) of src, reading one halo row on each side."""
+    rows, cols = src.shape
+    p = np.zeros((r1 - r0 + 2, cols + 2), dtype=np.uint8)
+    p[1:-1, 1:-1] = src[r0:r1]
+
+    # Halo rows come straight from the neighboring strips in shared memory.
+    if r0 > 0 or wrap:
+        p[0, 1:-1] = src[(r0 - 1) % rows]
+    if r1 < rows or wrap:
+        p[-1, 1:-1] = src[r1 % rows]
+
+    if wrap:
+        p[:, 0] = p[:, -2]
+        p[:, -1] = p[:, 1]
+
+    return step_padded(p, rule)
+
+
+def _worker(conn, names: list[str], shape: tuple[int, int], r0: int, r1: int, barrier) -> None:
+    shms = [shared_memory.SharedMemory(name=n) for n in names]
+    bufs = [np.ndarray(shape, dtype=np.uint8, buffer=s.buf) for s in shms]
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            n, wrap, parity, rule = msg
+            births = deaths = total_births = total_deaths = 0
+            for _ in range(n):
+                src, dst = bufs[parity], bufs[1 - parity]
+                new = _strip_next(src, r0, r1, wrap, rule)
+                births, deaths = rules.births_deaths(src[r0:r1], new, rule.states)
+                total_births += births
+                total_deaths += deaths
+                dst[r0:r1] = new
+                # Nobody may read the next generation until every strip is written.
+                barrier.wait()
+                parity ^= 1
+            conn.send((parity, births, deaths, total_births, total_deaths))
+    finally:
+        del bufs
+        for s in shms:
+            s.close()
+
+
+class ParallelEngine(Engine):
+    """
+    Splits the board into horizontal strips, one per worker process.
+
+    The board lives in two shared-memory buffers (current / next). Each worker
+    reads its strip plus one halo row above and below from the current buffer,
+    writes its strip into the next one, and waits on a barrier before the
+    buffers swap roles.
+    """
+
+    name = "parallel"
+    generations = True
+
+    def __init__(self, cols: int, rows: int, wrap: bool = True, workers: Optional[int] = None):
+        super().__init__(cols, rows, wrap)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, rows))
+
+        shape = (rows, cols)
+        self._shms = [shared_memory.SharedMemory(create=True, size=rows * cols) for _ in range(2)]
+        self._bufs = [np.ndarray(shape, dtype=np.uint8, buffer=s.buf) for s in self._shms]
+        for b in self._bufs:
+            b[:] = 0
+        self.parity = 0
+
+        ctx = mp.get_context()
+        barrier = ctx.Barrier(self.workers)
+        bounds = np.linspace(0, rows, self.workers + 1).astype(int)
+        names = [s.name for s in self._shms]
+
+        self._procs = []
+        self._conns = []
+        for i in range(self.workers):
+            parent, child = ctx.Pipe()
+            p = ctx.Process(
+                target=_worker,
+                args=(child, names, shape, int(bounds[i]), int(bounds[i + 1]), barrier),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+            self._conns.append(parent)
+
+    @property
+    def cells(self) -> np.ndarray:
+        return self._bufs[self.parity]
+
+    def to_array(self) -> np.ndarray:
+        return self.cells
+
+    def _load(self, cells: np.ndarray) -> None:
+        self.cells[:] = np.asarray(cells, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def get(self, col: int, row: int) -> bool:
+        return bool(self.cells[row, col] == 1)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        self.cells[row, col] = 1 if alive else 0
+
+    def step(self, n: int = 1) -> None:
+        if n <= 0:
+            return
+        for c in self._conns:
+            c.send((n, self.wrap, self.parity, self.rule))
+
+        births = deaths = total_births = total_deaths = 0
+        for c in self._conns:
+            self.parity, b, d, tb, td = c.recv()
+            births += b
+            deaths += d
+            total_births += tb
+            total_deaths += td
+
+        # Workers report per strip; fold the n generations into the stats at once.
+        self.revision += 1
+        s = self.stats
+        s.generation += n
+        s.population += total_births - total_deaths
+        s.births = births
+        s.deaths = deaths
+        s.total_births += total_births
+        s.total_deaths += total_deaths
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # The previous generation is still in the other buffer.
+        self.step()
+        return array_changes(self._bufs[1 - self.parity], self.cells)
+
+    def close(self) -> None:
+        if not self._procs:
+            return
+        for c in self._conns:
+            c.send(None)
+        for p in self._procs:
+            p.join()
+        self._procs = []
+        self._conns = []
+
+        self._bufs = []
+        for s in self._shms:
+            s.close()
+            s.unlink()
+
+
+def measure_speedup(cols: int, rows: int, generations: int, workers: Optional[int] = None,
+                    wrap: bool = True, p: float = 0.22, seed: int = 0) -> dict:
+    """Time the same soup on ArrayEngine and ParallelEngine."""
+    single = ArrayEngine(cols, rows, wrap=wrap)
+    single.randomize(p, seed=seed)
+    start = single.to_array().copy()
+
+    t0 = time.perf_counter()
+    single.step(generations)
+    single_s = time.perf_counter() - t0
+
+    par = ParallelEngine(cols, rows, wrap=wrap, workers=workers)
+    try:
+        par.load_array(start)
+        t0 = time.perf_counter()
+        par.step(generations)
+        parallel_s = time.perf_counter() - t0
+        same = bool(np.array_equal(par.to_array(), single.to_array()))
+        used = par.workers
+    finally:
+        par.close()
+
+    return {
+        "cols": cols,
+        "rows": rows,
+        "generations": generations,
+        "workers": used,
+        "single_s": single_s,
+        "parallel_s": parallel_s,
+        "speedup": single_s / parallel_s if parallel_s else 0.0,
+        "identical": same,
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Compare ParallelEngine against the single-process engine.")
+    ap.add_argument("--size", type=int, default=2000, help="board is size x size")
+    ap.add_argument("--generations", type=int, default=100)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--no-wrap", action="store_true")
+    args = ap.parse_args()
+
+    r = measure_speedup(args.size, args.size, args.generations, args.workers, wrap=not args.no_wrap)
+    print(f"{r['cols']}x{r['rows']}, {r['generations']} generations, {r['workers']} workers")
+    print(f"  single:   {r['single_s']:.3f} s")
+    print(f"  parallel: {r['parallel_s']:.3f} s")
+    print(f"  speedup:  {r['speedup']:.2f}x  (identical: {r['identical']})")
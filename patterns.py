@@ -0,0 +1,383 @@
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+
+import numpy as np
+
+# Text is read in blocks of this many characters, never as a whole.
+READ_CHUNK = 1 << 16
+
+
+# ----------------------------
+# JSON ({"alive": [[col, row], ...]}, see saved_pattern.json)
+# ----------------------------
+def load_json(path: str, cols: int, rows: int) -> np.ndarray:
+    """Read a JSON pattern into a (rows, cols) array; cells off the board are dropped."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    cells = np.zeros((rows, cols), dtype=np.uint8)
+    for c, r in data.get("alive", []):
+        if 0 <= c < cols and 0 <= r < rows:
+            cells[r, c] = 1
+    return cells
+
+
+def save_json(path: str, cells: np.ndarray) -> None:
+    rs, cs = np.nonzero(cells)
+    alive = [[int(c), int(r)] for r, c in zip(rs, cs)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"alive": alive}, f)
+
+
+def read_json(path: str) -> tuple[np.ndarray, np.ndarray]:
+    with open(path, "r", encoding="utf-8") as f:
+        alive = np.array(json.load(f).get("alive", []), dtype=np.int64).reshape(-1, 2)
+    return alive[:, 0], alive[:, 1]
+
+
+# ----------------------------
+# RLE (https://conwaylife.com/wiki/Run_Length_Encoded)
+# ----------------------------
+_RLE_TOKEN = re.compile(r"(\d*)(\D)")
+_RLE_HEADER = re.compile(r"(\w+)\s*=\s*([^,]+)")
+
+
+def _runs_to_points(starts: array, lengths: array, ys: array) -> tuple[np.ndarray, np.ndarray]:
+    """Expand (start, length, row) runs of live cells into coordinates."""
+    s = np.frombuffer(starts, dtype=np.int64)
+    n = np.frombuffer(lengths, dtype=np.int64)
+    y = np.frombuffer(ys, dtype=np.int64)
+    if n.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # x of the k-th cell overall = its run's start + its offset inside the run
+    first = np.cumsum(n) - n
+    xs = np.repeat(s - first, n) + np.arange(int(n.sum()), dtype=np.int64)
+    return xs, np.repeat(y, n)
+
+
+def read_rle(path: str) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Stream an RLE file into live-cell coordinates (top-left at 0, 0) plus its
+    header fields (x, y, rule). Only the runs are kept in memory, never the text.
+    """
+    header: dict = {}
+    starts, lengths, ys = array("q"), array("q"), array("q")
+    x = y = 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        rest = ""
+        for line in f:
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
+            if s.startswith("x"):
+                header = {k: v.strip() for k, v in _RLE_HEADER.findall(s)}
+            else:
+                rest = s  # no header line; this is already data
+            break
+
+        done = False
+        while not done:
+            chunk = f.read(READ_CHUNK)
+            buf = rest + "".join(chunk.split())
+            pos = 0
+            for m in _RLE_TOKEN.finditer(buf):
+                n = int(m.group(1)) if m.group(1) else 1
+                tag = m.group(2)
+                if tag in "b.":
+                    x += n
+                elif tag == "$":
+                    y += n
+                    x = 0
+                elif tag == "!":
+                    done = True
+                    break
+                else:  # o, or any other live state letter
+                    starts.append(x)
+                    lengths.append(n)
+                    ys.append(y)
+                    x += n
+                pos = m.end()
+            # A run count split across two blocks waits for its tag.
+            rest = buf[pos:]
+            if not chunk:
+                break
+
+    xs, ys_ = _runs_to_points(starts, lengths, ys)
+    return xs, ys_, header
+
+
+class _LineWriter:
+    """Writes tokens, starting a new line before one would exceed width."""
+
+    def __init__(self, f, width: int = 70):
+        self.f = f
+        self.width = width
+        self.used = 0
+
+    def write(self, token: str) -> None:
+        if self.used and self.used + len(token) > self.width:
+            self.f.write("\n")
+            self.used = 0
+        self.f.write(token)
+        self.used += len(token)
+
+
+def _run(n: int, tag: str) -> str:
+    return f"{n}{tag}" if n > 1 else tag
+
+
+def write_rle(path: str, cells: np.ndarray, rule: str = "B3/S23") -> None:
+    """Write a (rows, cols) array as RLE, one board row at a time."""
+    rows, cols = cells.shape
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"x = {cols}, y = {rows}, rule = {rule}\n")
+        out = _LineWriter(f)
+        last = 0  # row the writer is on
+        for r in range(rows):
+            row = cells[r]
+            if not row.any():
+                continue
+            if r > last:
+                out.write(_run(r - last, "$"))
+                last = r
+
+            # Run boundaries: indices where the row switches between dead and alive
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], row != 0, [0])).astype(np.int8)))
+            x = 0
+            for a, b in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+                if a > x:
+                    out.write(_run(a - x, "b"))
+                out.write(_run(b - a, "o"))
+                x = b
+        out.write("!")
+        f.write("\n")
+
+
+# ----------------------------
+# Plaintext (.cells: "." dead, "O" alive, "!" comment lines)
+# ----------------------------
+def read_cells(path: str) -> tuple[np.ndarray, np.ndarray]:
+    xs, ys = [], []
+    y = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("!"):
+                continue
+            row = np.frombuffer(line.rstrip("\r\n").encode("ascii"), dtype=np.uint8)
+            live = np.flatnonzero((row == ord("O")) | (row == ord("*")))
+            if live.size:
+                xs.append(live)
+                ys.append(np.full(live.size, y, dtype=np.int64))
+            y += 1
+    if not xs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(xs).astype(np.int64), np.concatenate(ys)
+
+
+def write_cells(path: str, cells: np.ndarray, name: str = "") -> None:
+    glyphs = np.array([ord("."), ord("O")], dtype=np.uint8)
+    with open(path, "w", encoding="utf-8") as f:
+        if name:
+            f.write(f"!Name: {name}\n")
+        for row in cells:
+            f.write(glyphs[(row != 0).astype(np.uint8)].tobytes().decode("ascii").rstrip(".") + "\n")
+
+
+# ----------------------------
+# Binary snapshot (.golsnap)
+# ----------------------------
+# Header, then rows of the board bit-packed (np.packbits, little bit order),
+# zlib-compressed unless FLAG_RAW. Raw snapshots are read straight out of
+# the memory-mapped file.
+SNAPSHOT_MAGIC = b"GOLSNAP1"
+_SNAPSHOT_HEADER = struct.Struct("<8sHHQQqqQ")  # magic, version, flags, cols, rows, x0, y0, generation
+FLAG_RAW = 1
+FLAG_WRAP = 2
+_SNAPSHOT_ROWS = 4096  # rows packed and compressed per block while writing
+_SNAPSHOT_BLOCK = 1 << 22  # packed bytes per block when going through points
+_SNAPSHOT_READ = 1 << 20  # compressed bytes fed to zlib at a time
+
+
+def _write_snapshot(path: str, cols: int, rows: int, x0: int, y0: int, generation: int,
+                    wrap: bool, compress: bool, blocks) -> None:
+    """Header, then the packed row blocks (bytes) in order."""
+    flags = (0 if compress else FLAG_RAW) | (FLAG_WRAP if wrap else 0)
+    with open(path, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, 1, flags, cols, rows, x0, y0, generation))
+        z = zlib.compressobj(1) if compress else None
+        for packed in blocks:
+            f.write(z.compress(packed) if z else packed)
+        if z:
+            f.write(z.flush())
+
+
+def save_snapshot(path: str, cells: np.ndarray, x0: int = 0, y0: int = 0, generation: int = 0,
+                  wrap: bool = False, compress: bool = True) -> None:
+    rows, cols = cells.shape
+    blocks = (np.packbits(cells[r:r + _SNAPSHOT_ROWS] != 0, axis=1, bitorder="little").tobytes()
+              for r in range(0, rows, _SNAPSHOT_ROWS))
+    _write_snapshot(path, cols, rows, x0, y0, generation, wrap, compress, blocks)
+
+
+def save_snapshot_points(path: str, xs: np.ndarray, ys: np.ndarray, generation: int = 0,
+                         wrap: bool = False, compress: bool = True) -> None:
+    """
+    save_snapshot() of the live cells at world (xs, ys), cropped to their
+    bounding box. Rows are packed a block at a time, so the board is never
+    built whole.
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    if xs.size == 0:
+        _write_snapshot(path, 0, 0, 0, 0, generation, wrap, compress, ())
+        return
+    x0, y0 = int(xs.min()), int(ys.min())
+    cols, rows = int(xs.max()) - x0 + 1, int(ys.max()) - y0 + 1
+    order = np.argsort(ys, kind="stable")
+    xs, ys = xs[order] - x0, ys[order] - y0
+
+    stride = (cols + 7) // 8
+    band = max(1, _SNAPSHOT_BLOCK // stride)
+
+    def blocks():
+        for r in range(0, rows, band):
+            n = min(band, rows - r)
+            lo, hi = np.searchsorted(ys, (r, r + n))
+            packed = np.zeros((n, stride), dtype=np.uint8)
+            bx = xs[lo:hi]
+            np.bitwise_or.at(packed, (ys[lo:hi] - r, bx >> 3), (1 << (bx & 7)).astype(np.uint8))
+            yield packed.tobytes()
+
+    _write_snapshot(path, cols, rows, x0, y0, generation, wrap, compress, blocks())
+
+
+def load_snapshot(path: str) -> tuple[np.ndarray, dict]:
+    """(rows, cols) cells plus {"x0", "y0", "generation", "wrap"}."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, flags, cols, rows, x0, y0, generation = _SNAPSHOT_HEADER.unpack_from(mm)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path}: not a board snapshot")
+
+        stride = (cols + 7) // 8
+        if flags & FLAG_RAW:
+            packed = np.frombuffer(mm, dtype=np.uint8, count=rows * stride, offset=_SNAPSHOT_HEADER.size)
+        else:
+            packed = np.frombuffer(zlib.decompress(mm[_SNAPSHOT_HEADER.size:]), dtype=np.uint8)
+        # unpackbits copies, so nothing refers to the map once it is closed
+        cells = np.unpackbits(packed.reshape(rows, stride), axis=1, count=cols, bitorder="little")
+        del packed
+
+    info = {"x0": x0, "y0": y0, "generation": generation, "wrap": bool(flags & FLAG_WRAP)}
+    return cells, info
+
+
+def load_snapshot_points(path: str) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    World (xs, ys) of a snapshot's live cells plus its info, unpacked a block
+    of rows at a time (the counterpart of save_snapshot_points()).
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, flags, cols, rows, x0, y0, generation = _SNAPSHOT_HEADER.unpack_from(mm)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path}: not a board snapshot")
+
+        pos = _SNAPSHOT_HEADER.size
+        z = None if flags & FLAG_RAW else zlib.decompressobj()
+
+        def read(n: int) -> bytes:
+            nonlocal pos
+            if z is None:
+                pos += n
+                return mm[pos - n:pos]
+            out = bytearray()
+            while len(out) < n:
+                src = z.unconsumed_tail
+                if not src:
+                    src = mm[pos:pos + _SNAPSHOT_READ]
+                    pos += len(src)
+                    if not src:
+                        break
+                out += z.decompress(src, n - len(out))
+            return bytes(out)
+
+        stride = (cols + 7) // 8
+        band = max(1, _SNAPSHOT_BLOCK // max(stride, 1))
+        xs, ys = [], []
+        for r in range(0, rows, band):
+            n = min(band, rows - r)
+            packed = np.frombuffer(read(n * stride), dtype=np.uint8).reshape(n, stride)
+            by, bx = np.nonzero(packed)
+            if by.size == 0:
+                continue
+            # Only the non-empty bytes are unpacked
+            bits = np.unpackbits(packed[by, bx][:, None], axis=1, bitorder="little")
+            k, i = np.nonzero(bits)
+            xs.append(bx[k].astype(np.int64) * 8 + i + x0)
+            ys.append(by[k].astype(np.int64) + r + y0)
+
+    info = {"x0": x0, "y0": y0, "generation": generation, "wrap": bool(flags & FLAG_WRAP)}
+    if not xs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), info
+    return np.concatenate(xs), np.concatenate(ys), info
+
+
+# ----------------------------
+# By file extension
+# ----------------------------
+FORMATS = (".json", ".rle", ".cells", ".golsnap")
+
+
+def _ext(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"{path}: unknown pattern format (expected one of {', '.join(FORMATS)})")
+    return ext
+
+
+def points_to_array(xs: np.ndarray, ys: np.ndarray, cols: int, rows: int) -> np.ndarray:
+    """(rows, cols) array of the given cells; cells off the board are dropped."""
+    keep = (xs >= 0) & (xs < cols) & (ys >= 0) & (ys < rows)
+    cells = np.zeros((rows, cols), dtype=np.uint8)
+    cells[ys[keep], xs[keep]] = 1
+    return cells
+
+
+def cells_to_points(cells: np.ndarray, x0: int = 0, y0: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    ys, xs = np.nonzero(cells)
+    return xs.astype(np.int64) + x0, ys.astype(np.int64) + y0
+
+
+def read_points(path: str) -> tuple[np.ndarray, np.ndarray]:
+    """World coordinates of the live cells; RLE and .cells patterns start at (0, 0)."""
+    ext = _ext(path)
+    if ext == ".json":
+        return read_json(path)
+    if ext == ".rle":
+        return read_rle(path)[:2]
+    if ext == ".cells":
+        return read_cells(path)
+    return load_snapshot_points(path)[:2]
+
+
+def load(path: str, cols: int, rows: int) -> np.ndarray:
+    """Any supported format into a (rows, cols) array; cells off the board are dropped."""
+    return points_to_array(*read_points(path), cols, rows)
+
+
+def save(path: str, cells: np.ndarray, rule: str = "B3/S23", **snapshot_info) -> None:
+    """Write cells in the format named by the extension; rule goes in RLE headers, snapshot_info to save_snapshot."""
+    ext = _ext(path)
+    if ext == ".json":
+        save_json(path, cells)
+    elif ext == ".rle":
+        write_rle(path, cells, rule)
+    elif ext == ".cells":
+        write_cells(path, cells)
+    else:
+        save_snapshot(path, cells, **snapshot_info)
@@ -0,0 +1,124 @@
+"""
+Per-frame timing of the window's hot path.
+
+The render loop marks the end of each phase of a frame with lap(); the
+simulation thread reports each generation with add_sim(). Durations go into
+rolling windows for the panel overlay (median and 95th percentile) and,
+optionally, one CSV row per frame. While disabled, every call returns
+before reading the clock.
+"""
+
+import csv
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+PHASES = ("events", "panel", "tiles", "text", "present")
+RENDER_PHASES = ("panel", "tiles", "text", "present")
+WINDOW = 240  # frames (and generations) the percentiles are taken over
+REFRESH = 0.25  # seconds between overlay updates
+
+
+class FrameProfiler:
+    """
+    One frame is begin(), lap(phase) after each of PHASES, end(). Timing is on
+    while the overlay is shown (toggle()) or a CSV file is being written.
+    """
+
+    def __init__(self, csv_path: Optional[str] = None, window: int = WINDOW):
+        self.show = False  # overlay visible
+        self.frames: deque = deque(maxlen=window)  # (start, {phase: seconds})
+        self.sim: deque = deque(maxlen=window)  # seconds per generation
+
+        self._frame = 0
+        self._t0 = 0.0
+        self._last = 0.0
+        self._laps: dict[str, float] = {}
+        self._pending: deque = deque()  # generations since the last frame (from the sim thread)
+        self._summary: Optional[dict] = None
+        self._summary_at = 0.0
+
+        self._csv_file = None
+        self._csv = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(("frame", "start_s") + tuple(f"{p}_ms" for p in PHASES)
+                               + ("frame_ms", "sim_ms", "generations"))
+        self._start = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self.show or self._csv is not None
+
+    def toggle(self) -> None:
+        """Show or hide the overlay; its windows start empty."""
+        self.show = not self.show
+        self.frames.clear()
+        self.sim.clear()
+        self._summary = None
+
+    # --- recording ---
+    def begin(self) -> None:
+        if not self.enabled:
+            return
+        self._t0 = self._last = time.perf_counter()
+        self._laps = {}
+
+    def lap(self, phase: str) -> None:
+        """phase ended now; it took the time since the previous lap (or begin)."""
+        if not self.enabled or not self._t0:
+            return
+        now = time.perf_counter()
+        self._laps[phase] = self._laps.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def add_sim(self, seconds: float) -> None:
+        """One generation took seconds (called from the simulation thread)."""
+        self._pending.append(seconds)
+
+    def end(self) -> None:
+        if not self.enabled or not self._t0:
+            return
+        gens = []
+        while self._pending:
+            gens.append(self._pending.popleft())
+        self.sim.extend(gens)
+        self.frames.append((self._t0, self._laps))
+        self._frame += 1
+
+        if self._csv is not None:
+            self._csv.writerow(
+                (self._frame, f"{self._t0 - self._start:.6f}")
+                + tuple(f"{self._laps.get(p, 0.0) * 1e3:.3f}" for p in PHASES)
+                + (f"{(self._last - self._t0) * 1e3:.3f}", f"{sum(gens) * 1e3:.3f}", len(gens)))
+        self._t0 = 0.0
+
+    # --- reading ---
+    def summary(self) -> Optional[dict]:
+        """Rolling percentiles in ms, FPS; recomputed at most every REFRESH seconds."""
+        now = time.perf_counter()
+        if self._summary is not None and now - self._summary_at < REFRESH:
+            return self._summary
+        if len(self.frames) < 2:
+            return None
+
+        starts = np.array([f[0] for f in self.frames])
+        render = np.array([sum(laps.get(p, 0.0) for p in RENDER_PHASES) for _, laps in self.frames]) * 1e3
+        total = np.array([sum(laps.values()) for _, laps in self.frames]) * 1e3
+        sim = np.array(self.sim) * 1e3 if self.sim else np.zeros(1)
+        self._summary = {
+            "fps": (len(starts) - 1) / max(starts[-1] - starts[0], 1e-9),
+            "frame": np.percentile(total, (50, 95)),
+            "render": np.percentile(render, (50, 95)),
+            "sim": np.percentile(sim, (50, 95)),
+        }
+        self._summary_at = now
+        return self._summary
+
+    def close(self) -> None:
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = self._csv = None
@@ -0,0 +1,335 @@
+from typing import Optional
+
+import numpy as np
+import pygame
+
+import vars
+import creatures
+import gameboard
+
+# Drawn-state codes per cell
+DEAD = 0
+ALIVE = 1
+HOVER = 2
+DYING = 3  # any state past 1 (Generations rules)
+
+# Above this share of changed cells, push the whole board as one rect.
+FULL_BOARD_FRACTION = 0.25
+
+
+def layout_key(layout: vars.Layout) -> tuple:
+    """Everything in a Layout that affects static drawing (Layout itself is unhashable)."""
+    return (
+        layout.screen_w, layout.screen_h, layout.panel_w, layout.pad,
+        layout.tile, layout.cols, layout.rows,
+        layout.board_x, layout.board_y, layout.board_w, layout.board_h,
+        id(layout.font_title), id(layout.font_ui), id(layout.font_small),
+    )
+
+
+class StaticLayers:
+    """
+    Pre-rendered background: window fill, panel chrome (shadow, title, underline,
+    dividers), and the empty board with its grid lines. Rebuilt only when the
+    layout or the divider positions change; everything else is blitted from it.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.background: Optional[pygame.Surface] = None
+        self.grid: Optional[pygame.Surface] = None
+
+    def get(self, layout: vars.Layout, gridlines: list[gameboard.GridLine],
+            dividers: tuple = ()) -> pygame.Surface:
+        key = (layout_key(layout), tuple(dividers))
+        if key != self.key:
+            self.background = self._build(layout, gridlines, dividers)
+            self.grid = self._build_grid(layout, gridlines)
+            self.key = key
+        return self.background
+
+    def _build(self, layout: vars.Layout, gridlines: list[gameboard.GridLine],
+               dividers: tuple) -> pygame.Surface:
+        surf = pygame.Surface((layout.screen_w, layout.screen_h))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+
+        surf.fill(vars.BG)
+        gameboard.draw_panel(surf, layout)
+        for x, y, w in dividers:
+            gameboard.draw_divider(surf, x, y, w)
+
+        # Empty board: every cell dead, then the grid on top
+        pygame.draw.rect(surf, vars.CELL_DEAD, (layout.board_x, layout.board_y, layout.board_w, layout.board_h))
+        for gl in gridlines:
+            gl.draw(surf)
+        return surf
+
+    def _build_grid(self, layout: vars.Layout, gridlines: list[gameboard.GridLine]) -> pygame.Surface:
+        """Grid lines alone, board-sized, transparent elsewhere (colorkey)."""
+        surf = pygame.Surface((layout.board_w + 1, layout.board_h + 1))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill((0, 0, 0))
+        surf.set_colorkey((0, 0, 0))
+        ox, oy = layout.board_x, layout.board_y
+        for gl in gridlines:
+            pygame.draw.line(surf, vars.GRID_LINE,
+                             (gl.start[0] - ox, gl.start[1] - oy), (gl.end[0] - ox, gl.end[1] - oy), 1)
+        return surf
+
+    def restore(self, surf: pygame.Surface, area: pygame.Rect) -> None:
+        """Copy the background back over area."""
+        surf.blit(self.background, area, area)
+
+
+class BoardRenderer:
+    """
+    Remembers what each cell looked like when it was last drawn and repaints
+    only the cells whose state (dead / alive / hovered) has changed since.
+    draw() returns the screen rects that need to be pushed to the display.
+    """
+
+    def __init__(self, layout: vars.Layout, layers: StaticLayers):
+        self.layout = layout
+        self.layers = layers
+        self.drawn = np.full((layout.rows, layout.cols), -1, dtype=np.int8)
+        self.version = None
+        self.hover = None
+
+    def invalidate(self, background: bool = False) -> None:
+        """Forget what is on screen. background=True: the static layer was just blitted (all dead)."""
+        self.drawn[:] = DEAD if background else -1
+        self.version = None
+
+    def board_rect(self) -> pygame.Rect:
+        lay = self.layout
+        return pygame.Rect(lay.board_x, lay.board_y, lay.board_w + 1, lay.board_h + 1)
+
+    def draw(self, surf: pygame.Surface, cells: np.ndarray, version, hover) -> list[pygame.Rect]:
+        """
+        cells: (rows, cols) cell states; version: anything that changes whenever
+        cells changes (lets an idle board skip the diff); hover: (col, row) or None.
+        """
+        if version == self.version and hover == self.hover:
+            return []
+
+        state = cells.astype(np.int8)
+        state[state > ALIVE] = DYING
+        if hover is not None:
+            state[hover[1], hover[0]] = HOVER
+
+        rs, cs = np.nonzero(state != self.drawn)
+        self.drawn = state
+        self.version = version
+        self.hover = hover
+        if rs.size == 0:
+            return []
+
+        lay = self.layout
+        t = lay.tile
+        rects = []
+        for r, c in zip(rs.tolist(), cs.tolist()):
+            x = lay.board_x + c * t
+            y = lay.board_y + r * t
+            rect = pygame.Rect(x, y, t + 1, t + 1)
+
+            # Dead cell and its four grid lines straight from the static layer
+            self.layers.restore(surf, rect)
+            s = state[r, c]
+            if s != DEAD:
+                if s == DYING:
+                    pygame.draw.rect(surf, vars.CELL_DYING, (x, y, t, t))
+                else:
+                    creatures.draw_cell(surf, lay, x, y, s == ALIVE, s == HOVER)
+                # The cell rect covers its own top/left grid lines; put them back.
+                pygame.draw.line(surf, vars.GRID_LINE, (x, y), (x + t, y), 1)
+                pygame.draw.line(surf, vars.GRID_LINE, (x, y), (x, y + t), 1)
+            rects.append(rect)
+
+        if len(rects) > FULL_BOARD_FRACTION * lay.cols * lay.rows:
+            return [self.board_rect()]
+        return rects
+
+
+class ArrayRenderer:
+    """
+    Draws the whole board from the state array in constant time: cell colors are
+    written into a cols x rows surface with surfarray, scaled up by layout.tile
+    in one call, and the cached grid overlay is blitted on top.
+    Same interface as BoardRenderer. The alive-cell sheen outline is not drawn.
+    """
+
+    def __init__(self, layout: vars.Layout, layers: StaticLayers):
+        self.layout = layout
+        self.layers = layers
+        self.palette = np.array([vars.CELL_DEAD, vars.CELL_ALIVE, vars.CELL_HOVER, vars.CELL_DYING], dtype=np.uint8)
+
+        self.small = pygame.Surface((layout.cols, layout.rows))
+        self.big = pygame.Surface((layout.board_w, layout.board_h))
+        if pygame.display.get_surface() is not None:
+            self.small = self.small.convert()
+            self.big = self.big.convert()
+
+        self.version = None
+        self.hover = None
+
+    def invalidate(self, background: bool = False) -> None:
+        self.version = None
+
+    def board_rect(self) -> pygame.Rect:
+        lay = self.layout
+        return pygame.Rect(lay.board_x, lay.board_y, lay.board_w + 1, lay.board_h + 1)
+
+    def draw(self, surf: pygame.Surface, cells: np.ndarray, version, hover) -> list[pygame.Rect]:
+        if version == self.version and hover == self.hover:
+            return []
+        self.version = version
+        self.hover = hover
+
+        # surfarray is indexed (x, y), i.e. (col, row)
+        idx = cells.T.astype(np.uint8)
+        idx[idx > ALIVE] = DYING
+        if hover is not None:
+            idx[hover[0], hover[1]] = HOVER
+        pygame.surfarray.blit_array(self.small, self.palette[idx])
+
+        lay = self.layout
+        pygame.transform.scale(self.small, (lay.board_w, lay.board_h), self.big)
+        surf.blit(self.big, (lay.board_x, lay.board_y))
+        surf.blit(self.layers.grid, (lay.board_x, lay.board_y))
+        return [self.board_rect()]
+
+
+class ViewportRenderer:
+    """
+    ArrayRenderer for a pannable, zoomable window (see gameboard.Viewport).
+    draw() takes the visible region (viewport.rows, viewport.cols) and a hover
+    cell in world coordinates; the last row/column may be cut off by the board
+    edge. Grid lines are drawn only when cells are at least GRID_MIN_TILE wide.
+
+    Zoomed out past one cell per pixel, the region holds live counts per block
+    instead (Board.visible_cells) and each pixel is shaded by its density, so
+    the frame costs the same however many cells are behind it.
+    """
+
+    GRID_MIN_TILE = 4
+
+    def __init__(self, layout: vars.Layout, layers: StaticLayers, viewport: gameboard.Viewport):
+        self.layout = layout
+        self.layers = layers
+        self.viewport = viewport
+        self.palette = np.array([vars.CELL_DEAD, vars.CELL_ALIVE, vars.CELL_HOVER, vars.CELL_DYING], dtype=np.uint8)
+        # Dead -> alive color ramp for density shading
+        t = np.linspace(0.0, 1.0, 256)[:, None]
+        self.ramp = ((1 - t) * np.array(vars.CELL_DEAD) + t * np.array(vars.CELL_ALIVE)).astype(np.uint8)
+
+        self.small: Optional[pygame.Surface] = None
+        self.big: Optional[pygame.Surface] = None
+        self.grids: dict[int, pygame.Surface] = {}  # per tile size
+
+        self.version = None
+        self.hover = None
+
+    def invalidate(self, background: bool = False) -> None:
+        self.version = None
+
+    def board_rect(self) -> pygame.Rect:
+        lay = self.layout
+        return pygame.Rect(lay.board_x, lay.board_y, lay.board_w + 1, lay.board_h + 1)
+
+    def _surface(self, cur: Optional[pygame.Surface], size: tuple[int, int]) -> pygame.Surface:
+        if cur is not None and cur.get_size() == size:
+            return cur
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        return surf
+
+    def _grid(self, tile: int) -> pygame.Surface:
+        grid = self.grids.get(tile)
+        if grid is None:
+            lay = self.layout
+            grid = self._surface(None, (lay.board_w + 1, lay.board_h + 1))
+            grid.fill((0, 0, 0))
+            grid.set_colorkey((0, 0, 0))
+            for x in range(0, lay.board_w + 1, tile):
+                pygame.draw.line(grid, vars.GRID_LINE, (x, 0), (x, lay.board_h), 1)
+            for y in range(0, lay.board_h + 1, tile):
+                pygame.draw.line(grid, vars.GRID_LINE, (0, y), (lay.board_w, y), 1)
+            pygame.draw.rect(grid, vars.GRID_LINE, grid.get_rect(), 1)
+            self.grids[tile] = grid
+        return grid
+
+    def draw(self, surf: pygame.Surface, cells: np.ndarray, version, hover) -> list[pygame.Rect]:
+        vp = self.viewport
+        version = (version, vp.key())
+        if version == self.version and hover == self.hover:
+            return []
+        self.version = version
+        self.hover = hover
+
+        rows, cols = cells.shape
+        if vp.block > 1:
+            # sqrt lifts sparse blocks so a lone glider still shows up
+            level = np.ceil(np.sqrt(cells.T / float(vp.block * vp.block)) * 255)
+            rgb = self.ramp[level.astype(np.uint8)]
+        else:
+            idx = cells.T.astype(np.uint8)
+            idx[idx > ALIVE] = DYING
+            rgb = self.palette[idx]
+        if hover is not None:
+            hc, hr = (hover[0] - vp.x0) // vp.block, (hover[1] - vp.y0) // vp.block
+            if 0 <= hc < cols and 0 <= hr < rows:
+                rgb[hc, hr] = vars.CELL_HOVER
+
+        self.small = self._surface(self.small, (cols, rows))
+        pygame.surfarray.blit_array(self.small, rgb)
+        if vp.tile == 1:
+            big = self.small
+        else:
+            self.big = self._surface(self.big, (cols * vp.tile, rows * vp.tile))
+            pygame.transform.scale(self.small, self.big.get_size(), self.big)
+            big = self.big
+
+        lay = self.layout
+        clip = surf.get_clip()
+        surf.set_clip(pygame.Rect(lay.board_x, lay.board_y, lay.board_w, lay.board_h))
+        surf.blit(big, (lay.board_x, lay.board_y))
+        surf.set_clip(clip)
+        if vp.tile >= self.GRID_MIN_TILE:
+            surf.blit(self._grid(vp.tile), (lay.board_x, lay.board_y))
+        else:
+            # Keep the board outline when the interior lines are hidden
+            pygame.draw.rect(surf, vars.GRID_LINE, self.board_rect(), 1)
+        return [self.board_rect()]
+
+
+RENDERERS = {
+    "array": ArrayRenderer,
+    "cells": BoardRenderer,
+}
+
+
+class DirtyRegions:
+    """Per-widget change tracking: a region is repainted only when its signature changes."""
+
+    def __init__(self):
+        self.sigs: dict = {}
+        self.rects: dict = {}
+
+    def reset(self) -> None:
+        self.sigs.clear()
+        self.rects.clear()
+
+    def changed(self, key, sig) -> bool:
+        if self.sigs.get(key, self) == sig:
+            return False
+        self.sigs[key] = sig
+        return True
+
+    def area(self, key, rect: pygame.Rect) -> pygame.Rect:
+        """rect grown to also cover what this region occupied last time it was drawn."""
+        prev = self.rects.get(key)
+        self.rects[key] = rect.copy()
+        return rect.union(prev) if prev is not None else rect.copy()
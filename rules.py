@@ -0,0 +1,154 @@
+"""
+Life-like rules, compiled to lookup tables.
+
+Rulestrings use B/S notation (B3/S23 is Conway, B36/S23 HighLife) or the
+older S/B form (23/3). A third field /C<n> (or S/B/C: 2/3/8) makes it a
+Generations rule with n states: a live cell (state 1) that does not survive
+turns into state 2 and then ages one state per generation until it is gone.
+Only state 1 counts as a neighbor, and only empty cells can be born.
+
+Every rule compiles to a lookup table: a 3x3 neighborhood is packed into
+9 bits, row by row from the top-left cell (bit 8) to the bottom-right one
+(bit 0), so the centre is bit 4, and Rule.table holds the next state of the
+centre for all 512 of them. Cell-at-a-time code (HashLife's 4x4 base case)
+indexes it directly. Whole-array steps use the same rule reduced to neighbor
+counts (next_alive), because a 512-entry gather per cell costs numpy several
+times a Conway generation; the compare expression it builds is the one
+hand-written for Conway, so any rule steps at that speed.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+
+
+def compile_table(birth, survive) -> np.ndarray:
+    """Next centre state (0/1) for every packed neighborhood, as a (512,) uint8 array."""
+    idx = np.arange(512)
+    bits = (idx[:, None] >> np.arange(9)) & 1
+    centre = bits[:, 4]
+    n = bits.sum(axis=1) - centre
+    nxt = np.where(centre == 1, np.isin(n, sorted(survive)), np.isin(n, sorted(birth)))
+    return nxt.astype(np.uint8)
+
+
+@dataclass(frozen=True)
+class Rule:
+    birth: frozenset
+    survive: frozenset
+    states: int = 2
+    name: str = field(default="", compare=False)
+
+    def __str__(self) -> str:
+        text = "B" + "".join(map(str, sorted(self.birth))) + "/S" + "".join(map(str, sorted(self.survive)))
+        return text + (f"/C{self.states}" if self.states > 2 else "")
+
+    @property
+    def label(self) -> str:
+        return self.name or str(self)
+
+    @cached_property
+    def table(self) -> np.ndarray:
+        return compile_table(self.birth, self.survive)
+
+
+def make_rule(birth, survive, states: int = 2, name: str = "") -> Rule:
+    return Rule(frozenset(birth), frozenset(survive), states, name)
+
+
+CONWAY = make_rule((3,), (2, 3), name="Life")
+
+# Shown in this order by the panel's Rule button
+PRESETS = {
+    "life": CONWAY,
+    "highlife": make_rule((3, 6), (2, 3), name="HighLife"),
+    "daynight": make_rule((3, 6, 7, 8), (3, 4, 6, 7, 8), name="Day & Night"),
+    "seeds": make_rule((2,), (), name="Seeds"),
+    "lifewithoutdeath": make_rule((3,), range(9), name="No Death"),
+    "brain": make_rule((2,), (), 3, name="Brian's Brain"),
+    "starwars": make_rule((2,), (3, 4, 5), 4, name="Star Wars"),
+}
+
+_BS = re.compile(r"B([0-8]*)/?S([0-8]*)(?:/?[CG]([0-9]+))?")
+_SB = re.compile(r"S([0-8]*)/?B([0-8]*)(?:/?[CG]([0-9]+))?")
+_NUMERIC = re.compile(r"([0-8]*)/([0-8]*)(?:/([0-9]+))?")  # S/B or S/B/C
+
+
+def parse_rule(text: str) -> Rule:
+    """A Rule from a rulestring (B3/S23, 23/3, B2/S/C3, 345/2/4) or a preset name."""
+    key = re.sub(r"[^a-z]", "", text.lower())
+    if key in PRESETS:
+        return PRESETS[key]
+
+    s = text.strip().upper().replace(" ", "")
+    m = _BS.fullmatch(s)
+    if m:
+        birth, survive, states = m.groups()
+    else:
+        m = _SB.fullmatch(s) or _NUMERIC.fullmatch(s)
+        if not m:
+            raise ValueError(f"bad rule {text!r} (expected B3/S23, 23/3, B2/S/C3 or one of {', '.join(PRESETS)})")
+        survive, birth, states = m.groups()
+
+    states = int(states) if states else 2
+    if not 2 <= states <= 256:
+        raise ValueError(f"bad rule {text!r}: a rule has 2 to 256 states")
+    rule = make_rule(map(int, birth), map(int, survive), states)
+    # Presets keep their names when spelled out
+    for preset in PRESETS.values():
+        if preset == rule:
+            return preset
+    return rule
+
+
+# ----------------------------
+# Whole-array form
+# ----------------------------
+def _runs(digits) -> list[tuple[int, int]]:
+    """Sorted digits as inclusive (first, last) runs: {2, 3, 4, 7} -> [(2, 4), (7, 7)]."""
+    runs: list[tuple[int, int]] = []
+    for d in sorted(digits):
+        if runs and d == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], d)
+        else:
+            runs.append((d, d))
+    return runs
+
+
+def count_in(n: np.ndarray, digits) -> np.ndarray:
+    """n in digits, elementwise, with one or two passes per run of consecutive digits."""
+    out = np.zeros(n.shape, dtype=bool)
+    for a, b in _runs(digits):
+        if a == b:
+            out |= n == a
+        elif a == 0:
+            out |= n <= b
+        else:
+            # uint8 wraps below a, so this is a <= n <= b
+            out |= (n - np.uint8(a)) <= b - a
+    return out
+
+
+def next_alive(rule: Rule, n: np.ndarray, alive: np.ndarray) -> np.ndarray:
+    """
+    0/1 next state from neighbor counts n and the current alive (bool) cells.
+    Counts that both birth and survival accept skip the alive test, so
+    B3/S23 compiles to (n == 3) | (alive & (n == 2)).
+    """
+    both = rule.birth & rule.survive
+    out = count_in(n, both)
+    if rule.survive - both:
+        out |= alive & count_in(n, rule.survive - both)
+    if rule.birth - both:
+        out |= ~alive & count_in(n, rule.birth - both)
+    return out.view(np.uint8)
+
+
+def births_deaths(old: np.ndarray, new: np.ndarray, states: int = 2) -> tuple[int, int]:
+    """Cells that became alive (state 1), and cells that stopped being alive."""
+    if states == 2:
+        return int(np.count_nonzero(new > old)), int(np.count_nonzero(new < old))
+    return (int(np.count_nonzero((new == 1) & (old != 1))),
+            int(np.count_nonzero((old == 1) & (new != 1))))
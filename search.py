@@ -0,0 +1,115 @@
+"""
+Random-soup search: many seeded soups, run to stabilization across a process pool.
+
+Every soup is a board randomized from its seed (the same soup Randomize or
+`life run --seed` makes), stepped until the cycle detector sees a repeat or
+the generation cap is reached. Results are appended to a JSONL file, one line
+per soup, in the order the workers finish them, and flushed as they arrive,
+so an interrupted search is resumed by running it again: seeds already in
+the file are skipped.
+
+    python -m life search --seeds 10000 --size 64x64 --out soups.jsonl
+"""
+
+import json
+import multiprocessing as mp
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+import cycles
+import engine
+import rules
+from rules import Rule
+
+
+@dataclass(frozen=True)
+class SoupSpec:
+    """Everything about a soup except its seed (sent to the workers once per task)."""
+
+    cols: int = 64
+    rows: int = 64
+    density: float = 0.22
+    wrap: bool = True
+    rule: Rule = rules.CONWAY
+    max_generations: int = 20000
+    engine: str = "numpy"  # any but "parallel" (pool workers cannot have child processes)
+    history: int = cycles.DEFAULT_HISTORY
+
+
+def run_soup(spec: SoupSpec, seed: int) -> dict:
+    """
+    Step one soup until it settles or hits spec.max_generations. lifespan is
+    the generation its final cycle started at (None if it never settled).
+    """
+    sim = engine.make_engine(spec.engine, spec.cols, spec.rows, wrap=spec.wrap)
+    try:
+        sim.set_rule(spec.rule)
+        sim.randomize(spec.density, seed=seed)
+        cycle = cycles.CycleDetector(spec.history)
+        xs, ys, states = sim.live_cells()
+        cycle.reset(xs, ys, 0, states)
+        while cycle.period is None and sim.stats.generation < spec.max_generations:
+            xs, ys, old, new = sim.step_changes()
+            cycle.advance(xs, ys, sim.stats.generation, old, new)
+        return {
+            "seed": seed,
+            "lifespan": cycle.since,
+            "period": cycle.period,
+            "final_population": sim.population(),
+            "generations": sim.stats.generation,
+        }
+    finally:
+        sim.close()
+
+
+def _run_task(task: tuple[SoupSpec, int]) -> dict:
+    return run_soup(*task)
+
+
+def completed_seeds(path: str) -> set[int]:
+    """Seeds already in a results file; a line cut short by an interrupted write is ignored."""
+    done: set[int] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(int(json.loads(line)["seed"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+def search(spec: SoupSpec, seeds, out: str, workers: Optional[int] = None, on_result=None) -> int:
+    """
+    Run every seed not already in out, appending one JSON line per soup as it
+    completes. on_result(record) is called for each. Returns the number run.
+    """
+    if spec.engine == "parallel":
+        raise ValueError("the parallel engine cannot run inside pool workers")
+    done = completed_seeds(out)
+    todo = [s for s in seeds if s not in done]
+    if not todo:
+        return 0
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    # Drop a partial last line before appending after it
+    if os.path.exists(out):
+        with open(out, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 4096))
+            tail = f.read()
+            keep = tail.rfind(b"\n") + 1
+            if keep != len(tail):
+                f.truncate(size - len(tail) + keep)
+
+    tasks = ((spec, s) for s in todo)
+    chunk = max(1, min(16, len(todo) // (workers * 8)))
+    with open(out, "a", encoding="utf-8") as f, mp.get_context().Pool(workers) as pool:
+        for record in pool.imap_unordered(_run_task, tasks, chunksize=chunk):
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            if on_result is not None:
+                on_result(record)
+    return len(todo)
@@ -0,0 +1,297 @@
+from typing import Optional
+
+import numpy as np
+
+import rules
+from engine import Engine, block_sum, step_padded
+
+CHUNK = 64
+
+
+# For a neighbor offset d in (-1, 0, 1): where its cells land in a
+# (CHUNK + 2)^2 window, and which of its cells are needed.
+def _halo_slices(size: int) -> dict:
+    dst = {-1: slice(0, 1), 0: slice(1, size + 1), 1: slice(size + 1, size + 2)}
+    src = {-1: slice(size - 1, size), 0: slice(0, size), 1: slice(0, 1)}
+    return {d: (dst[d], src[d]) for d in (-1, 0, 1)}
+
+
+class SparseEngine(Engine):
+    """
+    Unbounded plane stored as fixed-size chunks, created when a cell is born
+    in them and dropped as soon as they are empty.
+
+    A generation only visits occupied chunks, plus the neighbors of chunks
+    whose live cells touch a shared edge or corner. Memory and step cost
+    scale with the occupied area, not its bounding box.
+
+    Every chunk carries a revision number that changes whenever its cells do,
+    so zoomed-out views can reuse block reductions of unchanged chunks.
+
+    cols/rows only describe the window that to_array()/load_array() use
+    (world cells [0, cols) x [0, rows)); get()/set() accept any coordinates.
+    The plane has no edges, so wrap is always off.
+    """
+
+    name = "sparse"
+    unbounded = True
+    wraps = False
+    generations = True
+    # B0 would fill the whole plane
+    birth_on_zero = False
+
+    def __init__(self, cols: int, rows: int, wrap: bool = False, chunk: int = CHUNK):
+        super().__init__(cols, rows, wrap=False)
+        self.chunk = chunk
+        self.chunks: dict[tuple[int, int], np.ndarray] = {}
+        self.revs: dict[tuple[int, int], int] = {}
+        self._rev = 0
+        # (chunk key, block) -> (revision, block sums), for region_density()
+        self._lod: dict[tuple, tuple[int, np.ndarray]] = {}
+        self._halo = _halo_slices(chunk)
+
+    def set_wrap(self, wrap: bool) -> None:
+        # An unbounded plane has no seam to wrap around.
+        pass
+
+    def _touch(self, key: tuple[int, int]) -> None:
+        self._rev += 1
+        self.revs[key] = self._rev
+
+    def _reset(self) -> None:
+        self.chunks.clear()
+        self.revs.clear()
+
+    # --- cells ---
+    def get(self, col: int, row: int) -> bool:
+        ch = self.chunks.get((col // self.chunk, row // self.chunk))
+        return ch is not None and bool(ch[row % self.chunk, col % self.chunk] == 1)
+
+    def _put(self, col: int, row: int, alive: bool) -> None:
+        key = (col // self.chunk, row // self.chunk)
+        ch = self.chunks.get(key)
+        if alive:
+            if ch is None:
+                ch = self.chunks[key] = np.zeros((self.chunk, self.chunk), dtype=np.uint8)
+            ch[row % self.chunk, col % self.chunk] = 1
+            self._touch(key)
+        elif ch is not None:
+            ch[row % self.chunk, col % self.chunk] = 0
+            self._touch(key)
+            if not ch.any():
+                del self.chunks[key]
+                del self.revs[key]
+
+    def region(self, x0: int, y0: int, w: int, h: int) -> np.ndarray:
+        """Copy of world cells [x0, x0 + w) x [y0, y0 + h) as a (h, w) array."""
+        out = np.zeros((h, w), dtype=np.uint8)
+        c = self.chunk
+        for (cx, cy), ch in self.chunks.items():
+            # Overlap of this chunk with the region, in world coordinates
+            ax, ay = max(x0, cx * c), max(y0, cy * c)
+            bx, by = min(x0 + w, cx * c + c), min(y0 + h, cy * c + c)
+            if ax >= bx or ay >= by:
+                continue
+            out[ay - y0:by - y0, ax - x0:bx - x0] = ch[ay - cy * c:by - cy * c, ax - cx * c:bx - cx * c]
+        return out
+
+    def region_density(self, x0: int, y0: int, w: int, h: int, block: int) -> np.ndarray:
+        """Block sums assembled from cached per-chunk reductions (block must divide the chunk size)."""
+        c = self.chunk
+        if c % block or x0 % block or y0 % block:
+            return super().region_density(x0, y0, w, h, block)
+
+        n = c // block
+        out = np.zeros((h, w), dtype=np.uint16)
+        lod = {}
+        for key, ch in self.chunks.items():
+            # Chunk's top-left, in blocks relative to the region
+            bx = (key[0] * c - x0) // block
+            by = (key[1] * c - y0) // block
+            if bx >= w or by >= h or bx + n <= 0 or by + n <= 0:
+                continue
+            rev = self.revs[key]
+            hit = self._lod.get((key, block))
+            red = hit[1] if hit is not None and hit[0] == rev else block_sum(ch, block)
+            lod[(key, block)] = (rev, red)
+
+            ax, ay = max(bx, 0), max(by, 0)
+            ex, ey = min(bx + n, w), min(by + n, h)
+            out[ay:ey, ax:ex] = red[ay - by:ey - by, ax - bx:ex - bx]
+        # Only what this view used is kept, so the cache follows the viewport.
+        self._lod = lod
+        return out
+
+    def to_array(self) -> np.ndarray:
+        return self.region(0, 0, self.cols, self.rows)
+
+    def _load(self, cells: np.ndarray) -> None:
+        self._reset()
+        self.place(np.asarray(cells).reshape(self.rows, self.cols), 0, 0)
+
+    def place(self, cells: np.ndarray, x0: int, y0: int) -> None:
+        """OR a (h, w) array into the plane with its top-left at world (x0, y0)."""
+        ys, xs = np.nonzero(cells)
+        self.place_points(xs + x0, ys + y0)
+
+    def place_points(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        self.revision += 1
+        c = self.chunk
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        cxs, cys = xs // c, ys // c
+        for cx, cy in set(zip(cxs.tolist(), cys.tolist())):
+            sel = (cxs == cx) & (cys == cy)
+            ch = self.chunks.get((cx, cy))
+            if ch is None:
+                ch = self.chunks[(cx, cy)] = np.zeros((c, c), dtype=np.uint8)
+            ch[ys[sel] - cy * c, xs[sel] - cx * c] = 1
+            self._touch((cx, cy))
+        self.stats.population = self.count_population()
+
+    def load_points(self, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Replace the plane with live cells at world (xs, ys); like load_array, keeps the generation."""
+        self._reset()
+        self.place_points(xs, ys)
+        self.stats.births = 0
+        self.stats.deaths = 0
+
+    def bounds(self) -> Optional[tuple[int, int, int, int]]:
+        """(x0, y0, x1, y1) bounding the live cells (exclusive end), or None when empty."""
+        xs, ys = self.live_points()
+        if xs.size == 0:
+            return None
+        return int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1
+
+    def live_points(self) -> tuple[np.ndarray, np.ndarray]:
+        """World (xs, ys) of every non-empty cell."""
+        return self.live_cells()[:2]
+
+    def live_cells(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        xs, ys, states = [], [], []
+        c = self.chunk
+        for (cx, cy), ch in self.chunks.items():
+            r, q = np.nonzero(ch)
+            xs.append(q + cx * c)
+            ys.append(r + cy * c)
+            states.append(ch[r, q])
+        if not xs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+        return (np.concatenate(xs).astype(np.int64), np.concatenate(ys).astype(np.int64),
+                np.concatenate(states))
+
+    def snapshot(self):
+        # Stepping replaces chunk arrays rather than writing into them.
+        return dict(self.chunks), dict(self.revs)
+
+    def changes(self, snapshot) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Only chunks whose revision changed are compared."""
+        chunks, revs = snapshot
+        empty = np.zeros((self.chunk, self.chunk), dtype=np.uint8)
+        return self._chunk_changes(
+            (key, chunks.get(key, empty), self.chunks.get(key, empty))
+            for key in set(chunks) | set(self.chunks)
+            if revs.get(key) != self.revs.get(key))
+
+    def _chunk_changes(self, pairs) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """changes() from (key, old chunk, new chunk) triples."""
+        c = self.chunk
+        xs, ys, olds, news = [], [], [], []
+        for key, old, new in pairs:
+            r, q = np.nonzero(old != new)
+            xs.append(q + key[0] * c)
+            ys.append(r + key[1] * c)
+            olds.append(old[r, q])
+            news.append(new[r, q])
+        if not xs:
+            none = np.zeros(0, dtype=np.int64)
+            return none, none, none.astype(np.uint8), none.astype(np.uint8)
+        return (np.concatenate(xs).astype(np.int64), np.concatenate(ys).astype(np.int64),
+                np.concatenate(olds), np.concatenate(news))
+
+    def _drop_dying(self) -> None:
+        for key in list(self.chunks):
+            ch = self.chunks[key] = np.where(self.chunks[key] == 1, 1, 0).astype(np.uint8)
+            self._touch(key)
+            if not ch.any():
+                del self.chunks[key]
+                del self.revs[key]
+
+    def clear(self) -> None:
+        self._reset()
+        super().clear()
+
+    def count_population(self) -> int:
+        return int(sum(int(np.count_nonzero(ch == 1)) for ch in self.chunks.values()))
+
+    # --- evolution ---
+    def _candidates(self) -> list[tuple[int, int]]:
+        """Occupied chunks plus neighbors reachable across a live edge or corner."""
+        cand = set(self.chunks)
+        for (cx, cy), ch in self.chunks.items():
+            top, bottom = ch[0].any(), ch[-1].any()
+            left, right = ch[:, 0].any(), ch[:, -1].any()
+            if top:
+                cand.add((cx, cy - 1))
+            if bottom:
+                cand.add((cx, cy + 1))
+            if left:
+                cand.add((cx - 1, cy))
+            if right:
+                cand.add((cx + 1, cy))
+            if ch[0, 0]:
+                cand.add((cx - 1, cy - 1))
+            if ch[0, -1]:
+                cand.add((cx + 1, cy - 1))
+            if ch[-1, 0]:
+                cand.add((cx - 1, cy + 1))
+            if ch[-1, -1]:
+                cand.add((cx + 1, cy + 1))
+        return list(cand)
+
+    def step(self, n: int = 1) -> None:
+        for _ in range(n):
+            self._step_once()
+
+    def step_changes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return self._chunk_changes(self._step_once())
+
+    def _step_once(self) -> list:
+        """One generation; returns (key, old, new) for every chunk it changed."""
+        cand = self._candidates()
+        if not cand:
+            self._record(0, 0)
+            return []
+
+        c = self.chunk
+        halo = self._halo
+        win = np.zeros((len(cand), c + 2, c + 2), dtype=np.uint8)
+        for i, (cx, cy) in enumerate(cand):
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    nb = self.chunks.get((cx + dx, cy + dy))
+                    if nb is None:
+                        continue
+                    (dr, sr), (dc, sc) = halo[dy], halo[dx]
+                    win[i, dr, dc] = nb[sr, sc]
+
+        old = win[:, 1:-1, 1:-1]
+        new = step_padded(win, self.rule)
+
+        changed = (new != old).any(axis=(1, 2))
+        occupied = new.any(axis=(1, 2))
+
+        chunks, revs = {}, {}
+        for i, key in enumerate(cand):
+            if not occupied[i]:
+                continue
+            chunks[key] = new[i]
+            if changed[i]:
+                self._rev += 1
+                revs[key] = self._rev
+            else:
+                revs[key] = self.revs[key]
+        self.chunks = chunks
+        self.revs = revs
+        self._record(*rules.births_deaths(old, new, self.rule.states))
+        return [(cand[i], old[i], new[i]) for i in np.flatnonzero(changed)]
@@ -22,6 +22,7 @@ GRID_LINE = (38, 40, 46)
 CELL_DEAD = (30, 32, 38)
 CELL_ALIVE = (235, 220, 140)
 CELL_HOVER = (120, 190, 210)
+CELL_DYING = (150, 96, 72)  # Generations rules: cells past state 1
 
 BTN_BG = (46, 48, 56)
 BTN_BG_HOVER = (58, 60, 70)
@@ -59,6 +60,26 @@ class Layout:
 CAPTION = "Conway's Game of Life"
 FPS = 60
 
+# Generations advanced by the Jump (J) button (HashLife on the unbounded plane)
+JUMP_GENERATIONS = 1024
+# A board with edges is jumped by stepping it, this many generations at a
+# time, so quitting in the middle of a jump waits for one slice at most
+JUMP_SLICE = 8
+
+# Turbo mode (T): generations are stepped in batches of about this many
+# seconds, which bounds how long an edit waits for the board
+TURBO_BUDGET = 0.008
+
+# Rewind buffer behind Back (B): memory cap, and full frames every N generations
+HISTORY_MAX_BYTES = 64 * 1024 * 1024
+HISTORY_KEYFRAME_EVERY = 32
+
+# Rendered panel text kept by gameboard.render_text (least recently used go first)
+TEXT_CACHE_SIZE = 512
+
+# Board snapshot written by S and read back by L
+SNAPSHOT_PATH = "saved_board.golsnap"
+
 
 def choose_window_size() -> tuple[int, int]:
     """Pick a reasonable window size based on the user's display."""
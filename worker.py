@@ -0,0 +1,266 @@
+"""
+Background simulation thread.
+
+The worker owns stepping: it advances the board at the requested rate, or as
+fast as it can when generations are slower than that, and publishes what the
+window needs into one of two snapshot slots. The render loop takes the latest
+slot each frame and never waits for a generation to finish.
+
+With rate=None (turbo) it steps in batches sized to take about `budget`
+seconds each, and only the board after the last generation of a batch can
+be published. The batch size follows the measured generation time, so a
+waiting edit is held up by at most one batch (or one generation, when a
+single generation takes longer than the budget).
+
+Anything else that touches the engine (painting, clearing, loading, rewind)
+runs inside hold() or editing(), which get the board between generations;
+the worker lets them go first. Work too slow for a frame (a HashLife jump)
+is handed to submit() instead and runs on the worker thread, so the window
+keeps drawing the last snapshot meanwhile; stop() waits for it, so it should
+poll stopping and return early.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from engine import Stats
+
+DEFAULT_BUDGET = 0.008  # half a frame at 60 FPS
+RATE_WINDOW = 0.5  # seconds the achieved rate is averaged over
+
+
+@dataclass
+class Snapshot:
+    cells: np.ndarray  # what the board area shows, as Board.visible_cells() returned it
+    stats: Stats
+    info: dict = field(default_factory=dict)  # anything else the panel reads, captured with the cells
+    version: int = 0  # bumped on every publish
+
+
+class SimWorker:
+    """
+    step() advances one generation and returns False to pause (auto-pause).
+    capture() returns (cells, stats, info) for a snapshot; both are called
+    with lock held, so they see the board between generations.
+
+    Snapshots are double-buffered: latest() hands out the front slot and
+    publish() only ever writes the other one, so a snapshot stays intact
+    until the next latest() call.
+    """
+
+    def __init__(self, step: Callable[[], bool], capture: Callable[[], tuple],
+                 rate: Optional[float] = 10.0, budget: float = DEFAULT_BUDGET):
+        self._step = step
+        self._capture = capture
+        self.rate = rate  # generations per second; None = as many as possible
+        self.budget = budget  # seconds per turbo batch
+        self.lock = threading.RLock()
+        self.error: Optional[BaseException] = None
+
+        # Threads waiting in hold(); the worker does not start a generation while any are
+        self._turn = threading.Condition()
+        self._waiters = 0
+
+        # Turbo batch size, and the achieved generation rate
+        self._batch = 1
+        self.achieved = 0.0
+        self._counted = 0
+        self._count_from = time.perf_counter()
+
+        self._running = False
+        self._quit = False
+        self._tasks: deque = deque()  # submit()ted callables, oldest first
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._swap = threading.Lock()
+        self._slots: list[Optional[Snapshot]] = [None, None]
+        self._front = 0
+        self._held = 0  # slot the render loop is drawing from
+        self._version = 0
+        self._dirty = False  # board changed since the last publish
+        self._pending = False  # a published snapshot has not been taken yet
+
+    # --- control (render loop) ---
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @running.setter
+    def running(self, value: bool) -> None:
+        self._running = value
+        self._wake.set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sim-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def stopping(self) -> bool:
+        """stop() was called; a long submitted task should poll this and return early."""
+        return self._quit
+
+    def stop(self) -> None:
+        self._quit = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    @contextmanager
+    def hold(self):
+        """The board between generations; the worker waits until it is released."""
+        with self._turn:
+            self._waiters += 1
+        try:
+            with self.lock:
+                yield
+        finally:
+            with self._turn:
+                self._waiters -= 1
+                self._turn.notify_all()
+
+    @contextmanager
+    def editing(self):
+        """hold(), then publish the edited board."""
+        with self.hold():
+            yield
+            self.publish()
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """Run task on the worker thread between generations, then publish."""
+        self._tasks.append(task)
+        self._wake.set()
+
+    @property
+    def busy(self) -> bool:
+        """A submitted task has not finished yet."""
+        return bool(self._tasks)
+
+    def request(self) -> None:
+        """Ask for a fresh snapshot without waiting for it (e.g. the view moved)."""
+        self._dirty = True
+        self._wake.set()
+
+    def latest(self) -> Optional[Snapshot]:
+        with self._swap:
+            self._held = self._front
+            self._pending = False
+            return self._slots[self._front]
+
+    # --- publishing ---
+    def publish(self) -> None:
+        with self.lock:
+            cells, stats, info = self._capture()
+            self._dirty = False
+            with self._swap:
+                back = 1 - self._held
+                slot = self._slots[back]
+                if slot is None or slot.cells.shape != cells.shape or slot.cells.dtype != cells.dtype:
+                    slot = self._slots[back] = Snapshot(cells.copy(), stats, info)
+                else:
+                    np.copyto(slot.cells, cells)
+                    slot.stats, slot.info = stats, info
+                self._version += 1
+                slot.version = self._version
+                self._front = back
+                self._pending = True
+
+    # --- thread ---
+    def _wait(self, timeout: float) -> None:
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        except BaseException as e:  # surfaced to the render loop through .error
+            self.error = e
+            self._running = False
+
+    def _count(self, generations: int) -> None:
+        """Update the achieved rate (generations per second, over RATE_WINDOW)."""
+        self._counted += generations
+        now = time.perf_counter()
+        if not self._running:
+            self.achieved = 0.0
+        elif now - self._count_from < RATE_WINDOW:
+            return
+        else:
+            self.achieved = self._counted / (now - self._count_from)
+        self._counted = 0
+        self._count_from = now
+
+    def _batch_steps(self) -> None:
+        """Step up to self._batch generations in one hold of the lock (turbo)."""
+        n = 0
+        with self.lock:
+            t0 = time.perf_counter()
+            while n < self._batch and self._running and not self._quit:
+                n += 1
+                if not self._step():
+                    self._running = False
+            elapsed = time.perf_counter() - t0
+            if n:
+                self._dirty = True
+        if n == self._batch:
+            # Aim the next batch at the budget, growing at most 2x at a time
+            self._batch = max(1, min(2 * n, int(n * self.budget / max(elapsed, 1e-6))))
+        self._count(n)
+
+    def _loop(self) -> None:
+        next_at = time.perf_counter()
+        while not self._quit:
+            if self._tasks:
+                with self.lock:
+                    self._tasks[0]()
+                # Dropped only now, so busy covers the whole task
+                self._tasks.popleft()
+                if not self._quit:
+                    self.publish()
+                next_at = time.perf_counter()
+                continue
+
+            if self._dirty and not self._pending:
+                self.publish()
+
+            if not self._running:
+                if self._dirty:
+                    self.publish()
+                self._count(0)
+                self._wait(0.1)
+                next_at = time.perf_counter()
+                continue
+
+            # Let edits waiting for the board go first
+            with self._turn:
+                self._turn.wait_for(lambda: not self._waiters)
+
+            if self.rate is None:
+                self._batch_steps()
+                continue
+
+            now = time.perf_counter()
+            if now < next_at:
+                if self._dirty:
+                    self.publish()
+                self._wait(next_at - now)
+                continue
+
+            with self.lock:
+                # Paused (or stopped) while waiting for an edit to finish
+                if not self._running or self._quit:
+                    continue
+                if not self._step():
+                    self._running = False
+                self._dirty = True
+            self._count(1)
+
+            # A generation slower than the interval starts the next one right
+            # away instead of building up a backlog to catch up on.
+            next_at = max(next_at + 1.0 / max(0.1, self.rate), time.perf_counter())